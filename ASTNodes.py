@@ -1,44 +1,102 @@
 
+_set = object.__setattr__
+
+
 class ASTNode:
-    """Base class for all AST nodes."""
-    pass
+    """
+    Base class for all AST nodes.
+    Nodes are immutable once built, so a parsed program can be shared and run by many threads at once.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} nodes are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} nodes are immutable")
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, field) for field in self.__slots__)
 
 class Block(ASTNode):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
-        self.statements = statements
+        _set(self, 'statements', tuple(statements))
 
 class Literal(ASTNode):
+    __slots__ = ('value',)
+
     def __init__(self, value):
-        self.value = value
+        _set(self, 'value', value)
 
 class Identifier(ASTNode):
+    __slots__ = ('name',)
+
     def __init__(self, name):
-        self.name = name
+        _set(self, 'name', name)
 
 class BinaryOperation(ASTNode):
+    __slots__ = ('left', 'operator', 'right')
+
     def __init__(self, left, operator, right):
-        self.left = left
-        self.operator = operator
-        self.right = right
+        _set(self, 'left', left)
+        _set(self, 'operator', operator)
+        _set(self, 'right', right)
 
 class UnaryOperation(ASTNode):
+    __slots__ = ('operator', 'operand')
+
     def __init__(self, operator, operand):
-        self.operator = operator
-        self.operand = operand
+        _set(self, 'operator', operator)
+        _set(self, 'operand', operand)
 
 class VariableDeclaration(ASTNode):
+    __slots__ = ('name', 'initializer')
+
     def __init__(self, name, initializer=None):
-        self.name = name
-        self.initializer = initializer
+        _set(self, 'name', name)
+        _set(self, 'initializer', initializer)
 
 class Assignment(ASTNode):
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
-        self.name = name
-        self.value = value
+        _set(self, 'name', name)
+        _set(self, 'value', value)
 
 class PrintStatement(ASTNode):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
-        self.expression = expression
+        _set(self, 'expression', expression)
+
+def iter_child_nodes(node):
+    """Yield the direct child nodes of an AST node."""
+    if isinstance(node, Block):
+        yield from node.statements
+    elif isinstance(node, VariableDeclaration):
+        if node.initializer is not None:
+            yield node.initializer
+    elif isinstance(node, PrintStatement):
+        yield node.expression
+    elif isinstance(node, Assignment):
+        yield node.value
+    elif isinstance(node, BinaryOperation):
+        yield node.left
+        yield node.right
+    elif isinstance(node, UnaryOperation):
+        yield node.operand
+
+
+def walk(node):
+    """Yield an AST node and all of its descendants, in no particular order."""
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(iter_child_nodes(node))
 
 
 # class Null(ASTNode):
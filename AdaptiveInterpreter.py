@@ -0,0 +1,289 @@
+import operator
+from ASTNodes import BinaryOperation, Literal, Identifier
+from Interpreter import Interpreter
+from LanguageConstants import TokenType
+
+# Operand kinds recorded at each binary operation site
+FLOAT = "float"
+INT = "int"
+NUMERIC_STRING = "numeric string"
+STRING = "string"
+
+# Returned by a specialized handler when its type guard fails
+MISS = object()
+
+
+def divide(left, right):
+    if right == 0:
+        raise Exception("Division by zero.")
+    return left / right
+
+
+OPERATORS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: divide,
+}
+
+
+def operand_kind(value):
+    """
+    Classify an operand the way Interpreter.apply_binary_operator converts it.
+
+    :param value: The operand value
+    :return: The kind of the operand, or None if it has no specialized handler
+    """
+    value_type = type(value)
+    if value_type is float:
+        return FLOAT
+    if value_type is int:
+        return INT
+    if value_type is str:
+        try:
+            float(value)
+            return NUMERIC_STRING
+        except ValueError:
+            return STRING
+    return None
+
+
+def guard_float(value):
+    return value if type(value) is float else MISS
+
+
+def guard_int(value):
+    return value if type(value) is int else MISS
+
+
+def guard_numeric_string(value):
+    if type(value) is str:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return MISS
+
+
+def guard_string(value):
+    if type(value) is str:
+        try:
+            float(value)
+        except ValueError:
+            return value
+    return MISS
+
+
+GUARDS = {
+    FLOAT: guard_float,
+    INT: guard_int,
+    NUMERIC_STRING: guard_numeric_string,
+    STRING: guard_string,
+}
+
+
+def constant_guard(node):
+    """
+    Build a guard for a literal operand, which always has the same value and so needs no check.
+
+    :param node: The Literal node of the operand
+    :return: A guard returning the converted value of the literal
+    """
+    value = node.value
+    if type(value) is str:
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+    return lambda _: value
+
+
+def make_handler(node, left_kind, right_kind):
+    """
+    Build a handler specialized for one pair of operand kinds.
+    The handler returns MISS, without evaluating anything, when an operand doesn't match its kind.
+
+    :param node: The BinaryOperation node to specialize
+    :param left_kind: The kind of the left operand
+    :param right_kind: The kind of the right operand
+    :return: The specialized handler, or None if the kinds can't be specialized for this operator
+    """
+    operator_type = node.operator
+    apply = OPERATORS.get(operator_type)
+    if apply is None or left_kind is None or right_kind is None:
+        return None
+    if (left_kind == STRING or right_kind == STRING) and not (
+            left_kind == right_kind == STRING and operator_type == TokenType.PLUS):
+        # strings only support concatenation, anything else raises in the generic path
+        return None
+
+    if left_kind == right_kind == FLOAT:
+        def float_handler(left, right):
+            if type(left) is float and type(right) is float:
+                return apply(left, right)
+            return MISS
+        return float_handler
+
+    left_guard = constant_guard(node.left) if isinstance(node.left, Literal) else GUARDS[left_kind]
+    right_guard = constant_guard(node.right) if isinstance(node.right, Literal) else GUARDS[right_kind]
+
+    def handler(left, right):
+        left = left_guard(left)
+        if left is MISS:
+            return MISS
+        right = right_guard(right)
+        if right is MISS:
+            return MISS
+        return apply(left, right)
+    return handler
+
+
+class BinarySite:
+    """
+    The adaptive state of a single BinaryOperation node.
+    """
+
+    __slots__ = ('kinds', 'warmup', 'handler', 'hits', 'misses', 'specializations', 'deoptimizations', 'generic')
+
+    def __init__(self):
+        self.kinds = None
+        self.warmup = 0
+        self.handler = None
+        self.hits = 0
+        self.misses = 0
+        self.specializations = 0
+        self.deoptimizations = 0
+        self.generic = False
+
+
+class AdaptiveProfile:
+    """
+    The adaptive state of every BinaryOperation node of a program.
+    Straight-line programs execute each node once per run, so a profile is meant to be kept and passed to
+    the interpreter of every run of the same program. Concurrent runs can share a profile: every handler
+    checks its operands, so a race between threads only loses counter updates.
+
+    Attributes:
+        sites (dict): The BinarySite of each executed BinaryOperation node.
+    """
+
+    def __init__(self):
+        self.sites = {}
+
+    @property
+    def counters(self):
+        """
+        Totals of the counters of all the sites.
+
+        :return: A dictionary of the specialization hits, misses, specializations and de-optimizations
+        """
+        sites = list(self.sites.values())
+        return {
+            "hits": sum(site.hits for site in sites),
+            "misses": sum(site.misses for site in sites),
+            "specializations": sum(site.specializations for site in sites),
+            "deoptimizations": sum(site.deoptimizations for site in sites),
+        }
+
+
+class AdaptiveInterpreter(Interpreter):
+    """
+    An interpreter that specializes BinaryOperation nodes on the operand types they see.
+    Each node records its operand kinds while it runs through the generic path; once it has seen the
+    same kinds WARMUP times in a row, it switches to a handler specialized for them. A handler whose
+    type guard fails falls back to the generic path and is dropped (de-optimized), and a node that is
+    de-optimized more than MAX_DEOPTIMIZATIONS times stays generic.
+
+    Attributes:
+        profile (AdaptiveProfile): The adaptive state of the nodes, shared by all the runs using it.
+    """
+
+    WARMUP = 8
+    MAX_DEOPTIMIZATIONS = 4
+
+    def __init__(self, output=None, profile=None):
+        """
+        Initialize the interpreter with an empty environment.
+
+        :param output: The stream to print to, sys.stdout when None
+        :param profile: The AdaptiveProfile to record into and specialize from, a new one when None
+        """
+        super().__init__(output=output)
+        self.profile = profile if profile is not None else AdaptiveProfile()
+        self.sites = self.profile.sites
+
+    def evaluate_operand(self, node):
+        """
+        Evaluate an operand, reading literals and identifiers directly instead of dispatching on them.
+
+        :param node: The operand node
+        :return: The value of the operand
+        """
+        node_type = type(node)
+        if node_type is Literal:
+            return node.value
+        if node_type is Identifier:
+            return self.environment.get(node.name, None)
+        return self._interpret(node)
+
+    def evaluate_binary_operation(self, node: BinaryOperation):
+        """
+        Evaluate a binary operation through its specialized handler, if it has one.
+
+        :param node: The BinaryOperation node to evaluate
+        :return: The result of the binary operation
+        """
+        left = self.evaluate_operand(node.left)
+        right = self.evaluate_operand(node.right)
+
+        site = self.sites.get(node)
+        if site is None:
+            site = self.sites[node] = BinarySite()
+
+        handler = site.handler
+        if handler is not None:
+            result = handler(left, right)
+            if result is not MISS:
+                site.hits += 1
+                return result
+            site.misses += 1
+            self.deoptimize(site)
+
+        result = self.apply_binary_operator(node.operator, left, right)
+        if not site.generic:
+            self.record(site, node, operand_kind(left), operand_kind(right))
+        return result
+
+    def record(self, site, node, left_kind, right_kind):
+        """
+        Record the operand kinds seen by a site and specialize it once it is warmed up.
+
+        :param site: The BinarySite to update
+        :param node: The BinaryOperation node of the site
+        :param left_kind: The kind of the left operand
+        :param right_kind: The kind of the right operand
+        """
+        kinds = (left_kind, right_kind)
+        if kinds != site.kinds:
+            site.kinds = kinds
+            site.warmup = 0
+        site.warmup += 1
+        if site.warmup >= self.WARMUP:
+            site.handler = make_handler(node, left_kind, right_kind)
+            if site.handler is None:
+                site.generic = True
+            else:
+                site.specializations += 1
+
+    def deoptimize(self, site):
+        """
+        Drop the specialized handler of a site after its type guard failed.
+
+        :param site: The BinarySite to de-optimize
+        """
+        site.handler = None
+        site.kinds = None
+        site.warmup = 0
+        site.deoptimizations += 1
+        if site.deoptimizations > self.MAX_DEOPTIMIZATIONS:
+            site.generic = True
@@ -0,0 +1,377 @@
+import csv
+from collections import namedtuple
+from ASTNodes import (Block, PrintStatement, VariableDeclaration,
+                      BinaryOperation, UnaryOperation, Literal, Identifier, Assignment)
+from Interpreter import Interpreter
+from LanguageConstants import TokenType
+from Program import RecordingInterpreter
+from StaticAnalysis import variable_names
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BatchResult = namedtuple('BatchResult', ['outputs', 'errors'])
+
+if numpy is not None:
+    VECTOR_OPERATORS = {
+        TokenType.PLUS: numpy.add,
+        TokenType.MINUS: numpy.subtract,
+        TokenType.STAR: numpy.multiply,
+        TokenType.SLASH: numpy.divide,
+    }
+
+
+class NotVectorizable(Exception):
+    """Raised when an expression can't be evaluated on whole columns at once."""
+    pass
+
+
+def read_csv_columns(stream):
+    """
+    Read a CSV table with a header row into columns of bindings.
+    Columns whose values are all numbers hold floats, the others hold the strings as read.
+
+    :param stream: The text stream of the CSV table
+    :return: A dictionary of the values of each column, by column name
+    :raises Exception: If a row doesn't have a value for each column
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return {}
+    values = [[] for _ in header]
+    for record in reader:
+        if not record:
+            # blank lines, such as a trailing one, are not rows
+            continue
+        if len(record) != len(header):
+            raise Exception(f"Line {reader.line_num} has {len(record)} values, the header has {len(header)}.")
+        for column, value in zip(values, record):
+            column.append(value)
+
+    columns = {}
+    for name, column in zip(header, values):
+        try:
+            columns[name] = [float(value) for value in column]
+        except ValueError:
+            columns[name] = column
+    return columns
+
+
+def block_statements(block):
+    """
+    Yield the statements of a block in execution order, the statements of nested blocks in place.
+
+    :param block: The Block node
+    """
+    for statement in block.statements:
+        if isinstance(statement, Block):
+            yield from block_statements(statement)
+        else:
+            yield statement
+
+
+class BatchInterpreter:
+    """
+    Runs a program once over a table of input rows, each row binding the same free variables.
+
+    Each statement is evaluated on whole columns with NumPy when its expression only combines numbers with
+    the arithmetic operators, so one vectorized operation replaces one interpreter step per row.
+    Other statements (strings, '!', nested assignments, variables holding non-numbers) run row by row
+    through the regular interpreter. Rows that fail stop executing, exactly like a separate run per row.
+    Without NumPy every statement runs row by row.
+
+    Attributes:
+        rows (int): The number of input rows.
+        vectorized (int): The number of statements evaluated on whole columns.
+        row_statements (int): The number of statements evaluated row by row.
+    """
+
+    def __init__(self, columns, rows=None):
+        """
+        :param columns: A mapping of variable names to the sequence (or NumPy array) of their value in each row
+        :param rows: The number of rows, needed only when there are no columns
+        :raises Exception: If the columns don't all have the same number of rows
+        """
+        lengths = {len(column) for column in columns.values()}
+        if rows is not None:
+            lengths.add(rows)
+        if len(lengths) > 1:
+            raise Exception("All the columns must have the same number of rows.")
+        self.rows = lengths.pop() if lengths else 0
+        self.environment = {name: self.load_column(column) for name, column in columns.items()}
+        self.outputs = [[] for _ in range(self.rows)]
+        self.errors = [None] * self.rows
+        self.alive = numpy.ones(self.rows, dtype=bool) if numpy is not None else [True] * self.rows
+        self.interpreter = Interpreter()
+        self.vectorized = 0
+        self.row_statements = 0
+
+    @staticmethod
+    def load_column(column):
+        """
+        Store a column of input values, as a float array when it can be evaluated on whole.
+
+        :param column: The values of the column
+        :return: A NumPy float array, or a list of the row values
+        """
+        if numpy is not None:
+            if isinstance(column, numpy.ndarray):
+                if column.dtype == numpy.float64:
+                    return column
+                return column.tolist()
+            column = list(column)
+            if all(type(value) is float for value in column):
+                return numpy.array(column, dtype=numpy.float64)
+        return list(column)
+
+    def any_alive(self):
+        """
+        :return: True if some rows haven't failed
+        """
+        if numpy is not None:
+            return bool(self.alive.any())
+        return any(self.alive)
+
+    def alive_rows(self):
+        """
+        :return: The indexes of the rows that haven't failed
+        """
+        if numpy is not None:
+            return numpy.flatnonzero(self.alive).tolist()
+        return [row for row, alive in enumerate(self.alive) if alive]
+
+    def fail(self, rows, message):
+        """
+        Stop executing some rows with a runtime error.
+
+        :param rows: The indexes of the failing rows
+        :param message: The error message
+        """
+        for row in rows:
+            self.errors[row] = message
+            self.alive[row] = False
+
+    def run(self, block) -> BatchResult:
+        """
+        Run the program over every row.
+
+        :param block: The root Block of the program
+        :return: The printed values and the runtime error message (None on success) of each row
+        """
+        for statement in block_statements(block):
+            if not self.any_alive():
+                break
+            if numpy is None or not self.execute_vectorized(statement):
+                self.row_statements += 1
+                self.execute_rows(statement)
+        return BatchResult(self.outputs, self.errors)
+
+    def execute_vectorized(self, statement):
+        """
+        Execute a statement on whole columns.
+
+        :param statement: The statement to execute
+        :return: True if the statement was executed, False if it must run row by row
+        """
+        if isinstance(statement, VariableDeclaration):
+            if statement.name in self.environment:
+                self.fail(self.alive_rows(), f"Variable '{statement.name}' is already defined.")
+                return True
+            expression = statement.initializer
+        elif isinstance(statement, Assignment):
+            expression = statement.value
+        elif isinstance(statement, PrintStatement):
+            expression = statement.expression
+        else:
+            expression = statement
+
+        failed = numpy.zeros(self.rows, dtype=bool)
+        try:
+            with numpy.errstate(all="ignore"):
+                value = self.evaluate(expression, failed) if expression is not None else None
+        except NotVectorizable:
+            return False
+
+        self.vectorized += 1
+        self.fail(numpy.flatnonzero(failed & self.alive).tolist(), "Division by zero.")
+        if isinstance(statement, VariableDeclaration):
+            self.environment[statement.name] = value
+        elif isinstance(statement, Assignment):
+            if statement.name in self.environment:
+                self.environment[statement.name] = value
+            else:
+                self.fail(self.alive_rows(), f"Variable '{statement.name}' is not defined.")
+        elif isinstance(statement, PrintStatement):
+            self.record(value)
+        return True
+
+    def evaluate(self, node, failed):
+        """
+        Evaluate an expression on whole columns.
+        The value of an expression is either a float array with a value per row, or a single value shared by
+        all the rows.
+
+        :param node: The expression node
+        :param failed: A boolean array, set for the rows whose evaluation divides by zero
+        :return: The value of the expression
+        :raises NotVectorizable: If the expression can't be evaluated on whole columns
+        """
+        if isinstance(node, Literal):
+            return node.value
+        elif isinstance(node, Identifier):
+            value = self.environment.get(node.name, None)
+            if isinstance(value, list):
+                raise NotVectorizable()
+            return value
+        elif isinstance(node, BinaryOperation):
+            left = self.evaluate(node.left, failed)
+            right = self.evaluate(node.right, failed)
+            if not isinstance(left, numpy.ndarray) and not isinstance(right, numpy.ndarray):
+                return self.evaluate_shared(self.interpreter.apply_binary_operator, node.operator, left, right)
+            apply = VECTOR_OPERATORS.get(node.operator)
+            if apply is None:
+                raise NotVectorizable()
+            left = self.vector_operand(left)
+            right = self.vector_operand(right)
+            if node.operator == TokenType.SLASH:
+                zero = right == 0
+                if isinstance(zero, numpy.ndarray):
+                    failed |= zero
+                elif zero:
+                    failed[:] = True
+            return apply(left, right)
+        elif isinstance(node, UnaryOperation):
+            operand = self.evaluate(node.operand, failed)
+            if not isinstance(operand, numpy.ndarray):
+                return self.evaluate_shared(self.interpreter.apply_unary_operator, node.operator, operand)
+            if node.operator != TokenType.MINUS:
+                raise NotVectorizable()
+            return numpy.negative(operand)
+        raise NotVectorizable()
+
+    @staticmethod
+    def evaluate_shared(apply, *arguments):
+        """
+        Apply an operator to values shared by all the rows, with the semantics of the interpreter.
+
+        :param apply: The interpreter method applying the operator
+        :param arguments: The operator and the operands
+        :return: The shared result
+        :raises NotVectorizable: If the operation fails, so the rows fail in their own order
+        """
+        try:
+            return apply(*arguments)
+        except Exception:
+            raise NotVectorizable()
+
+    @staticmethod
+    def vector_operand(value):
+        """
+        Convert an operand combined with a column to a number, like the interpreter converts numeric strings.
+
+        :param value: The operand
+        :return: The operand as a float array or a float
+        :raises NotVectorizable: If the operand is not a number
+        """
+        if isinstance(value, numpy.ndarray) or type(value) is float:
+            return value
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        raise NotVectorizable()
+
+    def record(self, value):
+        """
+        Record a printed value for every row that hasn't failed.
+
+        :param value: The printed value, an array of per row values or a shared value
+        """
+        rows = self.alive_rows()
+        if isinstance(value, numpy.ndarray):
+            values = value.tolist()
+            for row in rows:
+                self.outputs[row].append(values[row])
+        else:
+            for row in rows:
+                self.outputs[row].append(value)
+
+    def execute_rows(self, statement):
+        """
+        Execute a statement row by row with the regular interpreter.
+
+        :param statement: The statement to execute
+        """
+        if isinstance(statement, (VariableDeclaration, Assignment)):
+            expression = statement.initializer if isinstance(statement, VariableDeclaration) else statement.value
+            written = {statement.name}
+        elif isinstance(statement, PrintStatement):
+            expression = statement.expression
+            written = set()
+        else:
+            expression = statement
+            written = set()
+        reads, writes = variable_names(expression) if expression is not None else (set(), set())
+        written |= writes
+
+        shared, per_row = {}, {}
+        for name in reads | written:
+            if name in self.environment:
+                value = self.environment[name]
+                if numpy is not None and isinstance(value, numpy.ndarray):
+                    per_row[name] = value.tolist()
+                elif isinstance(value, list):
+                    per_row[name] = value
+                else:
+                    shared[name] = value
+
+        interpreter = RecordingInterpreter(None)
+        results = {}
+        for row in self.alive_rows():
+            environment = dict(shared)
+            for name, values in per_row.items():
+                environment[name] = values[row]
+            interpreter.environment = environment
+            interpreter.outputs = self.outputs[row]
+            try:
+                interpreter._interpret(statement)
+            except Exception as e:
+                self.fail((row,), str(e))
+                continue
+            results[row] = environment
+
+        if not results:
+            return
+        for name in written:
+            column = [None] * self.rows
+            for row, environment in results.items():
+                column[row] = environment[name]
+            self.environment[name] = self.load_computed_column(column, results)
+
+    def load_computed_column(self, column, rows):
+        """
+        Store the values a statement computed row by row, as a float array when they are all floats.
+
+        :param column: The value of each row, None for the rows that failed
+        :param rows: The rows that computed a value
+        :return: A NumPy float array, or the list of values
+        """
+        if numpy is not None and all(type(column[row]) is float for row in rows):
+            return numpy.array([value if value is not None else 0.0 for value in column], dtype=numpy.float64)
+        return column
+
+
+def run_batch(program, columns, rows=None) -> BatchResult:
+    """
+    Run a compiled program over a table of input rows.
+
+    :param program: The Program to run
+    :param columns: A mapping of variable names to the sequence (or NumPy array) of their value in each row
+    :param rows: The number of rows, needed only when there are no columns
+    :return: The printed values and the runtime error message (None on success) of each row
+    """
+    return BatchInterpreter(columns, rows=rows).run(program.ast)
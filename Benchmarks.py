@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Micro benchmarks for the Ithon interpreter.
+
+Usage: python Benchmarks.py [benchmark ...]
+Runs every benchmark when no name is given. Checks, like stress and regressions, make the exit status non-zero when they fail.
+"""
+import io
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+import Program
+from Processes import interpreting
+from Interpreter import Interpreter
+from AdaptiveInterpreter import AdaptiveInterpreter, AdaptiveProfile
+from Transpiler import TranspiledProgram
+from DeadStoreElimination import eliminate_dead_stores
+from ASTNodes import walk, Literal
+from Tokenizer import Tokenizer
+from Parser import Parser
+from Interning import InterningParser, MemoizingInterpreter
+from ParallelInterpreter import ParallelInterpreter, free_threaded
+from LazyInterpreter import LazyInterpreter
+import BatchEvaluation
+from ByteTokenizer import ByteTokenizer, split_lines
+
+
+def best_time(func, repeat=5):
+    """
+    Run a function several times and return its fastest run time.
+
+    :param func: The function to time, called without arguments
+    :param repeat: The number of runs
+    :return: The fastest run time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def arithmetic_script(declarations: int) -> str:
+    """
+    Build a script of chained arithmetic declarations over the free variables x and y.
+
+    :param declarations: The number of declarations in the script
+    :return: The script source
+    """
+    lines = ["var v0 = x * 2 + y"]
+    for idx in range(1, declarations):
+        lines.append(f"var v{idx} = (v{idx - 1} + x) * 3 - y / 2")
+    lines.append(f"print(v{declarations - 1})")
+    return "\n".join(lines)
+
+
+def bench_compile_once():
+    """
+    Compare re-tokenizing and re-parsing a script for every input against compiling it once
+    and running the compiled Program with different bindings.
+    """
+    runs = 1000
+    source = arithmetic_script(20)
+    file_content = source.splitlines()
+
+    def rerun_everything():
+        with redirect_stdout(io.StringIO()):
+            for idx in range(runs):
+                bound = [f"var x = {idx}", "var y = 7"] + file_content
+                interpreting(file_content=bound)
+
+    def compile_once():
+        program = Program.compile(source)
+        for idx in range(runs):
+            program.run(bindings={"x": float(idx), "y": 7.0})
+
+    per_run = best_time(rerun_everything, repeat=3)
+    compiled = best_time(compile_once, repeat=3)
+    print(f"compile-once: {runs} runs of a {len(file_content)} line script")
+    print(f"  tokenize+parse+run per input: {per_run * 1000:8.2f} ms")
+    print(f"  compile once, run many:       {compiled * 1000:8.2f} ms  ({per_run / compiled:.1f}x)")
+
+
+def bench_adaptive():
+    """
+    Compare the generic Interpreter against the type-specializing AdaptiveInterpreter,
+    running the same program many times with one shared AdaptiveProfile.
+    """
+    runs = 300
+    lines = ["var y = 7", "var s = \"a\""]
+    for idx in range(50):
+        lines.append(f"x = (x + y * 2 - {idx % 7}) / 3")
+        lines.append("s = s + \"b\"")
+    lines.append("print(x)")
+    program = Program.compile("\n".join(lines))
+    profile = AdaptiveProfile()
+
+    def run(make_interpreter):
+        def run_many():
+            for idx in range(runs):
+                interpreter = make_interpreter()
+                interpreter.environment["x"] = float(idx)
+                interpreter.interpret(program.ast)
+        return run_many
+
+    generic = best_time(run(lambda: Interpreter(output=io.StringIO())))
+    adaptive = best_time(run(lambda: AdaptiveInterpreter(output=io.StringIO(), profile=profile)))
+    print(f"adaptive: {runs} runs of a {len(lines)} statement program")
+    print(f"  generic interpreter:  {generic * 1000:8.2f} ms")
+    print(f"  adaptive interpreter: {adaptive * 1000:8.2f} ms  ({generic / adaptive:.2f}x)")
+    print("  " + " ".join(f"{name}={count}" for name, count in profile.counters.items()))
+
+
+def bench_transpile():
+    """
+    Compare the tree-walking Interpreter against the program transpiled to Python.
+    """
+    lines = ["var x = 3", "var y = 7", "var s = \"a\""]
+    for idx in range(5000):
+        lines.append(f"x = (x + y * 2 - {idx % 7}) / 3")
+        lines.append("s = s + \"b\"")
+        if idx % 100 == 0:
+            lines.append("print(x)")
+    program = Program.compile("\n".join(lines))
+
+    interpreted = best_time(lambda: Interpreter(output=io.StringIO()).interpret(program.ast))
+    transpile = best_time(lambda: TranspiledProgram(program.ast))
+    transpiled_program = TranspiledProgram(program.ast)
+    transpiled = best_time(lambda: transpiled_program.run(output=io.StringIO()))
+    print(f"transpile: {len(lines)} statements")
+    print(f"  tree-walking interpreter: {interpreted * 1000:8.2f} ms")
+    print(f"  transpile and compile:    {transpile * 1000:8.2f} ms")
+    print(f"  transpiled run:           {transpiled * 1000:8.2f} ms  ({interpreted / transpiled:.1f}x)")
+
+
+def bench_dead_stores():
+    """
+    Compare running a script where most declarations are dead with and without dead store elimination.
+    """
+    lines = ["var base = 3"]
+    for idx in range(5000):
+        initializer = " + ".join(f"base * {term}" for term in range(1, 8))
+        lines.append(f"var v{idx} = {initializer}")
+        if idx % 10 == 0:
+            lines.append(f"v{idx} = v{idx} + 1")
+            lines.append(f"print(v{idx})")
+    program = Program.compile("\n".join(lines))
+
+    original = best_time(lambda: Interpreter(output=io.StringIO()).interpret(program.ast))
+    elimination = best_time(lambda: eliminate_dead_stores(program.ast))
+    optimized_ast, report = eliminate_dead_stores(program.ast)
+    optimized = best_time(lambda: Interpreter(output=io.StringIO()).interpret(optimized_ast))
+    print(f"dead-stores: {len(lines)} statements, {len(report)} eliminated")
+    print(f"  original run:    {original * 1000:8.2f} ms")
+    print(f"  elimination:     {elimination * 1000:8.2f} ms")
+    print(f"  optimized run:   {optimized * 1000:8.2f} ms  ({original / optimized:.1f}x)")
+
+
+def bench_interning():
+    """
+    Compare the plain AST against the hash-consed AST and memoized evaluation on a repetitive script.
+    """
+    lines = ["var a = 3", "var b = 4", "var c = 5"]
+    for idx in range(3000):
+        lines.append(f"var v{idx} = (a + b) * c - (a + b) * c / (a * b + c) + (a - b) * (a - b)")
+        if idx % 100 == 0:
+            lines.append(f"a = a + {idx}")
+    tokenizer = Tokenizer(file_content=lines)
+    tokenizer.tokenize()
+
+    def parse(parser_type):
+        tracemalloc.start()
+        parser = parser_type(tokenizer.tokens)
+        parser.parse()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        nodes = len({id(node) for node in walk(parser.ast)})
+        return parser.ast, nodes, retained
+
+    plain_ast, plain_nodes, plain_bytes = parse(Parser)
+    interned_ast, interned_nodes, interned_bytes = parse(InterningParser)
+    plain = best_time(lambda: Interpreter(output=io.StringIO()).interpret(plain_ast))
+    memoized = best_time(lambda: MemoizingInterpreter(output=io.StringIO()).interpret(interned_ast))
+    interpreter = MemoizingInterpreter(output=io.StringIO())
+    interpreter.interpret(interned_ast)
+    print(f"interning: {len(lines)} statements")
+    print(f"  plain AST:       {plain_nodes:8} nodes {plain_bytes / 1024:8.0f} KiB  run {plain * 1000:8.2f} ms")
+    print(f"  hash-consed AST: {interned_nodes:8} nodes {interned_bytes / 1024:8.0f} KiB  "
+          f"run {memoized * 1000:8.2f} ms  ({plain / memoized:.1f}x)")
+    print(f"  cache hits={interpreter.hits} misses={interpreter.misses}")
+
+
+def bench_parallel():
+    """
+    Compare sequential execution against the dependency-graph scheduler on independent declarations.
+    """
+    workers = os.cpu_count() or 1
+    terms = " + ".join(f"(x * {term} - x / {term + 1})" for term in range(150))
+    lines = ["var x = 3"] + [f"var v{idx} = {terms} + {idx}" for idx in range(400)] + ["print(v399)"]
+    program = Program.compile("\n".join(lines))
+
+    sequential = best_time(lambda: Interpreter(output=io.StringIO()).interpret(program.ast), repeat=3)
+    parallel = best_time(lambda: ParallelInterpreter(output=io.StringIO()).interpret(program.ast), repeat=3)
+    pool = "threads" if free_threaded() else "processes"
+    print(f"parallel: {len(lines)} statements, {workers} {pool}")
+    print(f"  sequential: {sequential * 1000:8.2f} ms")
+    print(f"  parallel:   {parallel * 1000:8.2f} ms  ({sequential / parallel:.2f}x)")
+
+
+def bench_lazy():
+    """
+    Compare eager and lazy initializers on a template-like script that declares far more than it uses.
+    """
+    lines = ["var base = 3"]
+    for idx in range(5000):
+        initializer = " + ".join(f"base * {term}" for term in range(1, 8))
+        lines.append(f"var v{idx} = {initializer}")
+        if idx % 20 == 0:
+            lines.append(f"print(v{idx})")
+    program = Program.compile("\n".join(lines))
+
+    eager = best_time(lambda: Interpreter(output=io.StringIO()).interpret(program.ast))
+    lazy = best_time(lambda: LazyInterpreter(output=io.StringIO()).interpret(program.ast))
+    interpreter = LazyInterpreter(output=io.StringIO())
+    interpreter.interpret(program.ast)
+    print(f"lazy: {len(lines)} statements")
+    print(f"  eager initializers: {eager * 1000:8.2f} ms")
+    print(f"  lazy initializers:  {lazy * 1000:8.2f} ms  ({eager / lazy:.1f}x)")
+    print(f"  created={interpreter.created} forced={interpreter.forced} never_forced={interpreter.never_forced}")
+
+
+def run_threads(threads, func):
+    """
+    Run a function on several threads started together, and time until the last one finishes.
+
+    :param threads: The number of threads
+    :param func: The function each thread runs, called with the index of its thread
+    :return: The elapsed time in seconds
+    """
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            func(index)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def threads_workload():
+    """
+    Build the shared program and the inputs the thread stress check and benchmark run.
+
+    :return: The program source, the compiled Program and a list of input bindings
+    """
+    source = arithmetic_script(200)
+    inputs = [{"x": float(x), "y": float(x % 7)} for x in range(64)]
+    return source, Program.compile(source), inputs
+
+
+def stress_threads():
+    """
+    Compile and run a shared program from many threads at once, checking every result against a sequential
+    run and that the shared AST can't be modified.
+
+    :return: 0 if every result matched, 1 otherwise
+    """
+    source, program, inputs = threads_workload()
+    expected = [program.run(bindings).outputs for bindings in inputs]
+    rounds = 20
+
+    def stress(index):
+        for round_number in range(rounds):
+            # compiling concurrently exercises the tokenizer and parser, running exercises the shared AST
+            compiled = Program.compile(source) if round_number % 5 == 0 else program
+            for offset in range(len(inputs)):
+                position = (index + offset) % len(inputs)
+                result = compiled.run(inputs[position])
+                if result.outputs != expected[position] or result.error is not None:
+                    raise Exception(f"thread {index}: wrong result for {inputs[position]}: {result}")
+        try:
+            program.ast.statements[0].initializer.left.left = Literal("0.0")
+        except AttributeError:
+            pass
+        else:
+            raise Exception("a shared AST node was modified")
+
+    threads = max(os.cpu_count() or 1, 4)
+    # switch threads as often as possible, so the GIL build interleaves the runs too
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        run_threads(threads, stress)
+    except Exception as e:
+        print(f"stress: FAILED: {e}", file=sys.stderr)
+        return 1
+    finally:
+        sys.setswitchinterval(switch_interval)
+    print(f"stress: {threads} threads x {rounds} rounds x {len(inputs)} runs matched the sequential results")
+    return 0
+
+
+# Programs that once ran differently on the optimized paths than on the interpreter
+REGRESSIONS = {
+    "operation on a numeric concatenation is kept": 'var a = "in"\nvar b = "f"\nvar c = a + b\n'
+                                                    'var d = c + "x"\nprint("ok")',
+    "transpiled name python rejects": 'var a\u00b2 = 1\nprint(a\u00b2)',
+    "transpiled names python normalizes together": 'var \ufb01 = 1\nvar fi = 2\nprint(\ufb01)',
+}
+
+
+def run_output(run):
+    """
+    Run a program and capture what it prints.
+
+    :param run: A function running the program, called with the output stream
+    :return: The status code and the printed text, or the exception the run raised
+    """
+    output = io.StringIO()
+    try:
+        status = run(output)
+    except Exception as e:
+        return e, output.getvalue()
+    return status, output.getvalue()
+
+
+def check_regressions():
+    """
+    Check that the programs of REGRESSIONS run the same with dead store elimination and transpiled as they do
+    with the interpreter.
+
+    :return: 0 if every program ran the same, 1 otherwise
+    """
+    failures = 0
+    for name, source in REGRESSIONS.items():
+        program = Program.compile(source)
+        expected = run_output(lambda output: Interpreter(output=output).interpret(program.ast))
+        optimized_ast, _ = eliminate_dead_stores(program.ast)
+        modes = {
+            "optimized": lambda output: Interpreter(output=output).interpret(optimized_ast),
+            "transpiled": lambda output: TranspiledProgram(program.ast).run(output),
+        }
+        for mode, run in modes.items():
+            actual = run_output(run)
+            if actual != expected:
+                print(f"regressions: FAILED: {name} ({mode}): expected {expected!r}, got {actual!r}", file=sys.stderr)
+                failures += 1
+    if failures:
+        return 1
+    print(f"regressions: {len(REGRESSIONS)} programs ran the same optimized and transpiled")
+    return 0
+
+
+def bench_threads():
+    """
+    Measure the run throughput of a shared program as threads are added.
+    Threads only scale on free-threaded Python; with the GIL the throughput stays flat.
+    The results are checked by the stress entry.
+    """
+    source, program, inputs = threads_workload()
+    runs = 256
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    baseline = None
+    print(f"threads: {runs} runs of a {len(program.ast.statements)} statement script")
+    for count in counts:
+        def run_share(index):
+            for run in range(index, runs, count):
+                program.run(inputs[run % len(inputs)])
+
+        elapsed = min(run_threads(count, run_share) for _ in range(3))
+        baseline = baseline or elapsed
+        print(f"  {count:3d} threads: {runs / elapsed:9.1f} runs/s  ({baseline / elapsed:.2f}x)")
+    print(f"  free-threaded: {free_threaded()}")
+
+
+def bench_batch():
+    """
+    Compare one run per input row against evaluating the rows as columns, in rows per second.
+    """
+    rows = 20000
+    program = Program.compile(arithmetic_script(20))
+    columns = {"x": [float(row % 97) for row in range(rows)], "y": [float(row % 13 + 1) for row in range(rows)]}
+
+    def run_rows():
+        for row in range(rows):
+            program.run({"x": columns["x"][row], "y": columns["y"][row]})
+
+    per_row = best_time(run_rows, repeat=1)
+    batch = best_time(lambda: BatchEvaluation.run_batch(program, columns), repeat=3)
+    print(f"batch: {rows} rows of a {len(program.ast.statements)} statement script")
+    print(f"  run per row:    {rows / per_row:12.0f} rows/s")
+    if BatchEvaluation.numpy is None:
+        print(f"  batch (no NumPy, row by row): {rows / batch:12.0f} rows/s  ({per_row / batch:.1f}x)")
+    else:
+        print(f"  batch columns:  {rows / batch:12.0f} rows/s  ({per_row / batch:.1f}x)")
+
+
+def bench_bytes():
+    """
+    Compare decoding a source to lines and tokenizing them against scanning its bytes,
+    in throughput and in memory allocated per MB of source.
+    """
+    source = (arithmetic_script(2000) + '\nprint("done") // the end\n').encode() * 4
+    megabytes = len(source) / 2 ** 20
+
+    def tokenize_lines():
+        tokenizer = Tokenizer(split_lines(source))
+        tokenizer.tokenize()
+        return tokenizer
+
+    def tokenize_bytes():
+        tokenizer = ByteTokenizer(source)
+        tokenizer.tokenize()
+        return tokenizer
+
+    print(f"bytes: {megabytes:.2f} MB of source")
+    for name, tokenize in (("lines", tokenize_lines), ("bytes", tokenize_bytes)):
+        elapsed = best_time(tokenize, repeat=3)
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+        tokenizer = tokenize()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks = sys.getallocatedblocks() - blocks
+        print(f"  {name}: {megabytes / elapsed:6.2f} MB/s  peak {peak / megabytes / 2 ** 20:6.1f} MB/MB  "
+              f"retained {retained / megabytes / 2 ** 20:6.1f} MB/MB  {blocks / megabytes:9.0f} blocks/MB  "
+              f"({len(tokenizer.tokens)} tokens)")
+        del tokenizer
+
+
+BENCHMARKS = {
+    "compile-once": bench_compile_once,
+    "adaptive": bench_adaptive,
+    "transpile": bench_transpile,
+    "dead-stores": bench_dead_stores,
+    "interning": bench_interning,
+    "parallel": bench_parallel,
+    "lazy": bench_lazy,
+    "threads": bench_threads,
+    "stress": stress_threads,
+    "regressions": check_regressions,
+    "batch": bench_batch,
+    "bytes": bench_bytes,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}", file=sys.stderr)
+            print(f"possible benchmarks: [{', '.join(BENCHMARKS)}]", file=sys.stderr)
+            return 1
+    status = 0
+    for name in names:
+        if BENCHMARKS[name]():
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import io
+import re
+from typing import List, Union
+from LanguageConstants import SUPPORTED_TOKENS, TokenType, LANGUAGE_IDENTIFIERS
+from Tokens import Token
+from Tokenizer import Tokenizer
+
+# ========== character classes ============
+OTHER = 0
+DIGIT = 1
+WORD = 2  # letters and '_', which start identifiers
+QUOTE = 3
+OPERATOR = 4  # characters that may start a two character token
+SINGLE = 5  # characters that are always a token on their own
+SPACE = 6
+NON_ASCII = 7
+
+QUOTE_BYTE = ord('"')
+DOT_BYTE = ord(".")
+
+
+def build_tables():
+    """
+    Build the 256-entry tables the scanner classifies bytes with, from the tokens the Tokenizer supports.
+
+    :return: The class of each byte, the token type of each SINGLE byte, the token type of each OPERATOR byte
+             alone, the token types of each OPERATOR byte followed by another byte, and the bytes str.strip removes
+    """
+    classes = [OTHER] * 256
+    single_types = [None] * 256
+    operator_types = [None] * 256
+    operator_follows = [None] * 256
+    for char, token_type in SUPPORTED_TOKENS.items():
+        if char is None or char == Tokenizer.STRING_CHAR:
+            continue
+        byte = ord(char)
+        if isinstance(token_type, dict):
+            classes[byte] = OPERATOR
+            operator_types[byte] = token_type[None]
+            operator_follows[byte] = {ord(follow): follow_type for follow, follow_type in token_type.items()
+                                      if follow is not None}
+        elif token_type == TokenType.WHITESPACE:
+            classes[byte] = SPACE
+        else:
+            classes[byte] = SINGLE
+            single_types[byte] = token_type
+    for byte in range(128):
+        char = chr(byte)
+        if char.isdigit():
+            classes[byte] = DIGIT
+        elif char.isalpha() or char == "_":
+            classes[byte] = WORD
+    classes[QUOTE_BYTE] = QUOTE
+    for byte in range(128, 256):
+        classes[byte] = NON_ASCII
+    strip = [chr(byte).isspace() for byte in range(128)] + [False] * 128
+    return classes, single_types, operator_types, operator_follows, strip
+
+
+CLASSES, SINGLE_TYPES, OPERATOR_TYPES, OPERATOR_FOLLOWS, STRIP = build_tables()
+
+# spans the scanner skips over in one call, on bytes or any other buffer without copying it
+NEWLINE = re.compile(rb"\r\n|\r|\n")
+WORD_RUN = re.compile(rb"[A-Za-z0-9_]*")
+NUMBER_RUN = re.compile(rb"[0-9]*(?:\.[0-9]*)?")
+STRING_END = re.compile(rb'"')
+NON_ASCII_BYTE = re.compile(rb"[\x80-\xff]")
+
+
+def split_lines(source, encoding: str = "utf-8") -> List[str]:
+    """
+    Decode a source into lines, the way reading the file in text mode does.
+
+    :param source: The raw source
+    :param encoding: The encoding of the source
+    :return: The lines of the source, with their line endings
+    """
+    return io.TextIOWrapper(io.BytesIO(source), encoding=encoding).readlines()
+
+
+class ByteTokenizer(Tokenizer):
+    """
+    A tokenizer that scans the raw bytes of a source instead of a list of decoded lines.
+    Bytes are classified with precomputed 256-entry tables, runs of identifier, number and string characters
+    are skipped over without building their lexeme character by character, and only the lexemes of emitted
+    tokens are decoded. The tokens and errors are exactly those of the Tokenizer on the decoded lines.
+    Lines containing non-ASCII characters are decoded and scanned by the Tokenizer.
+    """
+
+    def __init__(self, source: Union[bytes, bytearray, memoryview], encoding: str = "utf-8") -> None:
+        """
+        :param source: The raw source, not copied
+        :param encoding: The encoding of the source, used for lines containing non-ASCII characters
+        """
+        super().__init__(file_content=[])
+        self.source = source if isinstance(source, (bytes, bytearray)) else memoryview(source).cast("B")
+        self.encoding = encoding
+
+    def tokenize(self) -> int:
+        data = self.source
+        length = len(data)
+        position = 0
+        line_number = 0
+        while position < length:
+            line_number += 1
+            newline = NEWLINE.search(data, position)
+            if newline is None:
+                end, next_position = length, length
+            else:
+                end, next_position = newline.span()
+
+            if NON_ASCII_BYTE.search(data, position, end) is None:
+                self.tokenize_bytes(data, position, end, line_number)
+            else:
+                line = str(data[position:end], self.encoding)
+                self.tokenize_line(content=line.strip(), line_number=line_number)
+            position = next_position
+
+        self.add_token(SUPPORTED_TOKENS.get(None), None)
+        return self.status_code
+
+    def tokenize_bytes(self, data, start: int, end: int, line_number: int) -> None:
+        """
+        Scan a single ASCII line and tokenize it.
+
+        :param data: The raw source
+        :param start: The offset of the line
+        :param end: The offset of the end of the line, without the line ending
+        :param line_number: line number that scanned
+        """
+        classes = CLASSES
+        append = self.tokens.append
+
+        # skip the characters str.strip removes, without copying the line
+        while start < end and STRIP[data[start]]:
+            start += 1
+        while end > start and STRIP[data[end - 1]]:
+            end -= 1
+
+        position = start
+        while position < end:
+            byte = data[position]
+            kind = classes[byte]
+            if kind == SPACE:
+                position += 1
+            elif kind == WORD:
+                position = self.scan_word(data, position, end)
+            elif kind == DIGIT:
+                number_end = NUMBER_RUN.match(data, position, end).end()
+                lexeme = str(data[position:number_end], "ascii")
+                if number_end < end and data[number_end] == DOT_BYTE:
+                    # a second dot in a number is an error, and is consumed with it
+                    self.add_error_token(line_number, f"Unexpected character: {lexeme}", self.TOKENIZER_ERROR)
+                    position = number_end + 1
+                else:
+                    append(Token(TokenType.NUMBER, lexeme, str(float(lexeme))))
+                    position = number_end
+            elif kind == QUOTE:
+                string_end = STRING_END.search(data, position + 1, end)
+                if string_end is None:
+                    # only a string with characters after its quote is reported
+                    if end > position + 1:
+                        self.add_error_token(line_number, "Unterminated string.", self.TOKENIZER_ERROR)
+                    return
+                literal = str(data[position + 1:string_end.start()], "ascii")
+                append(Token(TokenType.STRING, f'"{literal}"', literal))
+                position = string_end.end()
+            elif kind == OPERATOR:
+                following = position + 1
+                if following == end:
+                    append(Token(OPERATOR_TYPES[byte], chr(byte), "null"))
+                    return
+                follow = data[following]
+                follow_type = OPERATOR_FOLLOWS[byte].get(follow)
+                if follow == QUOTE_BYTE:
+                    # a string right after an operator drops the operator
+                    position = following
+                elif follow_type == TokenType.COMMENT:
+                    return
+                elif follow_type is not None:
+                    append(Token(follow_type, chr(byte) + chr(follow), "null"))
+                    position = following + 1
+                else:
+                    append(Token(OPERATOR_TYPES[byte], chr(byte), "null"))
+                    if classes[follow] == DIGIT:
+                        # digits right after an operator start an identifier, not a number
+                        position = self.scan_word(data, following, end)
+                    else:
+                        position = following
+            elif kind == SINGLE:
+                append(Token(SINGLE_TYPES[byte], chr(byte), "null"))
+                position += 1
+            else:
+                self.add_error_token(line_number, f"Unexpected character: {chr(byte)}", self.TOKENIZER_ERROR)
+                position += 1
+
+    def scan_word(self, data, start: int, end: int) -> int:
+        """
+        Scan an identifier or a keyword.
+
+        :param data: The raw source
+        :param start: The offset of the first character of the word
+        :param end: The offset of the end of the line
+        :return: The offset after the word
+        """
+        word_end = WORD_RUN.match(data, start, end).end()
+        if word_end < end and data[word_end] == QUOTE_BYTE:
+            # a string right after a word drops the word
+            return word_end
+        lexeme = str(data[start:word_end], "ascii")
+        self.tokens.append(Token(LANGUAGE_IDENTIFIERS.get(lexeme, TokenType.IDENTIFIER), lexeme, "null"))
+        return word_end
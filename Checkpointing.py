@@ -0,0 +1,154 @@
+import hashlib
+import json
+import math
+import os
+import time
+from typing import List
+from Interpreter import Interpreter
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".ckpt"
+DEFAULT_INTERVAL = "30s"
+
+
+def source_digest(file_content: List[str]) -> str:
+    """
+    Get a digest identifying a program source, to check a checkpoint belongs to it.
+
+    :param file_content: The lines of the program
+    :return: The hex digest of the source
+    """
+    digest = hashlib.sha256()
+    for line in file_content:
+        digest.update(line.encode())
+    return digest.hexdigest()
+
+
+def parse_interval(interval: str):
+    """
+    Parse a checkpoint interval, either a number of statements ("5000") or of seconds ("30s").
+
+    :param interval: The interval to parse
+    :return: The number of statements and the number of seconds, one of them None
+    :raises ValueError: If the interval is not a positive, finite number of statements or seconds
+    """
+    if interval.endswith("s"):
+        seconds = float(interval[:-1])
+        if not math.isfinite(seconds) or seconds <= 0:
+            raise ValueError(f"Invalid checkpoint interval: {interval}")
+        return None, seconds
+    statements = int(interval)
+    if statements <= 0:
+        raise ValueError(f"Invalid checkpoint interval: {interval}")
+    return statements, None
+
+
+def save_checkpoint(path, digest, position, environment) -> None:
+    """
+    Atomically write a checkpoint, so a crash while writing never leaves a broken checkpoint behind.
+    The checkpoint is plain JSON, so loading one can never run code.
+
+    :param path: The checkpoint file path
+    :param digest: The digest of the program source
+    :param position: The index of the next statement to execute
+    :param environment: The environment after the statements before position
+    """
+    snapshot = {"version": CHECKPOINT_VERSION, "digest": digest, "position": position, "environment": environment}
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(snapshot, file)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path, digest):
+    """
+    Read a checkpoint written for a program.
+
+    :param path: The checkpoint file path
+    :param digest: The digest of the program source
+    :return: The index of the next statement to execute and the environment to resume with
+    :raises Exception: If the checkpoint is malformed, or was written by another version or for another program
+    """
+    with open(path) as file:
+        try:
+            snapshot = json.load(file)
+        except ValueError:
+            raise Exception(f"Checkpoint '{path}' is not a valid checkpoint.")
+    if not isinstance(snapshot, dict):
+        raise Exception(f"Checkpoint '{path}' is not a valid checkpoint.")
+    version = snapshot.get("version")
+    if version != CHECKPOINT_VERSION:
+        raise Exception(f"Unsupported checkpoint version: {version}")
+    if snapshot.get("digest") != digest:
+        raise Exception(f"Checkpoint '{path}' was written for a different program.")
+    position, environment = snapshot.get("position"), snapshot.get("environment")
+    if type(position) is not int or position < 0 or not isinstance(environment, dict):
+        raise Exception(f"Checkpoint '{path}' is not a valid checkpoint.")
+    return position, environment
+
+
+class CheckpointingInterpreter(Interpreter):
+    """
+    An interpreter that periodically snapshots the environment and the position in the program to disk,
+    so a failed or killed run can be resumed from its latest checkpoint.
+    Statements executed between the latest checkpoint and the failure run again when resuming.
+    The checkpoint is removed once the program completes successfully.
+    """
+
+    def __init__(self, path, digest, every_statements=None, every_seconds=None, position=0, output=None):
+        """
+        Initialize the interpreter with an empty environment.
+
+        :param path: The checkpoint file path
+        :param digest: The digest of the program source
+        :param every_statements: The number of statements between two checkpoints
+        :param every_seconds: The number of seconds between two checkpoints
+        :param position: The index of the statement to start from, when resuming
+        :param output: The stream to print to, sys.stdout when None
+        """
+        super().__init__(output=output)
+        self.path = path
+        self.digest = digest
+        self.every_statements = every_statements
+        self.every_seconds = every_seconds
+        self.position = position
+        self.root = None
+        self.checkpoints = 0
+
+    def interpret(self, node):
+        """
+        Interpret the given AST node from the starting position, checkpointing its top-level block.
+
+        :param node: The root node of the AST to interpret
+        :return: INTERPRETER_SUCCESS if execution was successful, INTERPRETER_ERROR otherwise
+        """
+        self.root = node
+        status = super().interpret(node)
+        if status == Interpreter.INTERPRETER_SUCCESS and os.path.exists(self.path):
+            os.remove(self.path)
+        return status
+
+    def execute_block(self, block):
+        """
+        Execute each statement of the block, writing a checkpoint whenever the interval has passed.
+
+        :param block: The Block node containing the statements to execute
+        """
+        if block is not self.root:
+            return super().execute_block(block)
+
+        statements = block.statements
+        every_statements = self.every_statements
+        every_seconds = self.every_seconds
+        since_checkpoint = 0
+        next_time = time.monotonic() + every_seconds if every_seconds else None
+        for idx in range(self.position, len(statements)):
+            self._interpret(statements[idx])
+            since_checkpoint += 1
+            if (every_statements and since_checkpoint >= every_statements) or \
+                    (next_time is not None and time.monotonic() >= next_time):
+                save_checkpoint(self.path, self.digest, idx + 1, self.environment)
+                self.checkpoints += 1
+                since_checkpoint = 0
+                if next_time is not None:
+                    next_time = time.monotonic() + every_seconds
@@ -0,0 +1,198 @@
+import asyncio
+import io
+import time
+from collections import namedtuple
+from typing import List
+from ASTNodes import (Block, PrintStatement, VariableDeclaration,
+                      BinaryOperation, UnaryOperation, Literal, Identifier, Assignment)
+from Interpreter import Interpreter
+from Tokenizer import Tokenizer
+from Parser import Parser
+
+
+class ExecutionBudgetExceeded(Exception):
+    """Raised when a program runs past its step budget or its wall-clock deadline."""
+    pass
+
+
+class CooperativeInterpreter(Interpreter):
+    """
+    An interpreter that runs as a generator, so execution can be paused and interleaved with other work.
+    Every evaluated AST node counts as one step; the generator yields every `yield_every` steps and
+    aborts the program once it runs past its step budget or its wall-clock deadline.
+    """
+
+    INTERPRETER_BUDGET_EXCEEDED = 4
+    DEFAULT_YIELD_EVERY = 100
+
+    def __init__(self, yield_every=DEFAULT_YIELD_EVERY, step_budget=None, time_limit=None, output=None):
+        """
+        Initialize the interpreter.
+
+        :param yield_every: The number of evaluated nodes between two yields
+        :param step_budget: The maximal number of nodes to evaluate, unlimited when None
+        :param time_limit: The maximal wall-clock run time in seconds, unlimited when None
+        :param output: The stream to print to, sys.stdout when None
+        :raises ValueError: If yield_every is less than 1, or step_budget or time_limit is negative
+        """
+        if yield_every < 1:
+            raise ValueError(f"yield_every must be at least 1, got {yield_every}")
+        if step_budget is not None and step_budget < 0:
+            raise ValueError(f"step_budget must not be negative, got {step_budget}")
+        if time_limit is not None and time_limit < 0:
+            raise ValueError(f"time_limit must not be negative, got {time_limit}")
+        super().__init__(output=output)
+        self.yield_every = yield_every
+        self.step_budget = step_budget
+        self.time_limit = time_limit
+        self.deadline = None
+        self.steps = 0
+
+    def execute(self, node):
+        """
+        Interpret the given AST node step by step.
+        Each yielded value is the number of nodes evaluated so far.
+
+        :param node: The root node of the AST to interpret
+        :return: The status code of the run, as the generator's return value
+        """
+        if self.time_limit is not None:
+            self.deadline = time.monotonic() + self.time_limit
+        try:
+            yield from self._evaluate(node)
+            return Interpreter.INTERPRETER_SUCCESS
+        except ExecutionBudgetExceeded as e:
+            print(f"Runtime error: {e}", file=self.output)
+            return CooperativeInterpreter.INTERPRETER_BUDGET_EXCEEDED
+        except Exception as e:
+            print(f"Runtime error: {e}", file=self.output)
+            return Interpreter.INTERPRETER_ERROR
+
+    def interpret(self, node):
+        """
+        Interpret the given AST node to completion, still enforcing the step budget and deadline.
+
+        :param node: The root node of the AST to interpret
+        :return: The status code of the run
+        """
+        execution = self.execute(node)
+        while True:
+            try:
+                next(execution)
+            except StopIteration as stop:
+                return stop.value
+
+    def _check_deadline(self):
+        """
+        Abort the program if it ran past its wall-clock deadline.
+
+        :raises ExecutionBudgetExceeded: If the deadline has passed
+        """
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ExecutionBudgetExceeded(f"Time limit of {self.time_limit} seconds exceeded.")
+
+    def _evaluate(self, node):
+        """
+        Generator version of Interpreter._interpret, counting one step per evaluated node.
+
+        :param node: The AST node to interpret
+        :return: The result of the execution, as the generator's return value
+        """
+        self.steps += 1
+        if self.step_budget is not None and self.steps > self.step_budget:
+            raise ExecutionBudgetExceeded(f"Step budget of {self.step_budget} nodes exceeded.")
+        if self.steps % self.yield_every == 0:
+            self._check_deadline()
+            yield self.steps
+            self._check_deadline()
+
+        if isinstance(node, Block):
+            for statement in node.statements:
+                yield from self._evaluate(statement)
+        elif isinstance(node, VariableDeclaration):
+            if node.name in self.environment:
+                raise Exception(f"Variable '{node.name}' is already defined.")
+            value = (yield from self._evaluate(node.initializer)) if node.initializer else None
+            self.environment[node.name] = value
+        elif isinstance(node, PrintStatement):
+            value = yield from self._evaluate(node.expression)
+            print(value, file=self.output)
+        elif isinstance(node, Assignment):
+            value = yield from self._evaluate(node.value)
+            if node.name in self.environment:
+                self.environment[node.name] = value
+            else:
+                raise Exception(f"Variable '{node.name}' is not defined.")
+        elif isinstance(node, BinaryOperation):
+            left = yield from self._evaluate(node.left)
+            right = yield from self._evaluate(node.right)
+            return self.apply_binary_operator(node.operator, left, right)
+        elif isinstance(node, UnaryOperation):
+            operand = yield from self._evaluate(node.operand)
+            return self.apply_unary_operator(node.operator, operand)
+        elif isinstance(node, Literal):
+            return node.value
+        elif isinstance(node, Identifier):
+            return self.environment.get(node.name, None)
+        else:
+            raise Exception(f"Unsupported AST node type: {type(node).__name__}")
+
+
+ScriptResult = namedtuple('ScriptResult', ['status', 'output'])
+
+
+async def run_script(file_content: List[str], yield_every=CooperativeInterpreter.DEFAULT_YIELD_EVERY,
+                     step_budget=None, time_limit=None) -> ScriptResult:
+    """
+    Tokenize, parse and cooperatively interpret a single script inside the running event loop.
+    The script gets its own environment and output buffer, and hands control back to the loop
+    every `yield_every` evaluated nodes.
+
+    :param file_content: The lines of the script
+    :param yield_every: The number of evaluated nodes between two switches to other tasks
+    :param step_budget: The maximal number of nodes to evaluate, unlimited when None
+    :param time_limit: The maximal wall-clock run time in seconds, unlimited when None
+    :return: The status code and everything the script printed
+    """
+    output = io.StringIO()
+    tokenizer = Tokenizer(file_content=file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        output.writelines(f"{err_token}\n" for err_token in tokenizer.errors)
+        return ScriptResult(Tokenizer.TOKENIZER_ERROR, output.getvalue())
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse(output=output) != Parser.PARSER_SUCCESS:
+        return ScriptResult(Parser.PARSER_ERROR, output.getvalue())
+
+    interpreter = CooperativeInterpreter(yield_every=yield_every, step_budget=step_budget,
+                                         time_limit=time_limit, output=output)
+    execution = interpreter.execute(parser.ast)
+    while True:
+        try:
+            next(execution)
+        except StopIteration as stop:
+            return ScriptResult(stop.value, output.getvalue())
+        # let every other script run its slice before resuming this one
+        await asyncio.sleep(0)
+
+
+async def run_scripts(scripts: List[List[str]], **limits) -> List[ScriptResult]:
+    """
+    Run many scripts concurrently in the running event loop.
+
+    :param scripts: The lines of each script
+    :param limits: yield_every, step_budget and time_limit, applied to every script
+    :return: The result of each script, in the order of the scripts
+    """
+    return await asyncio.gather(*(run_script(file_content, **limits) for file_content in scripts))
+
+
+def run_many(scripts: List[List[str]], **limits) -> List[ScriptResult]:
+    """
+    Run many scripts concurrently in a new event loop.
+
+    :param scripts: The lines of each script
+    :param limits: yield_every, step_budget and time_limit, applied to every script
+    :return: The result of each script, in the order of the scripts
+    """
+    return asyncio.run(run_scripts(scripts, **limits))
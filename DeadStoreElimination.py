@@ -0,0 +1,138 @@
+from collections import namedtuple
+from typing import Iterable
+from ASTNodes import Block, PrintStatement, VariableDeclaration, Assignment
+from StaticAnalysis import UNKNOWN, analyze_expression, variable_names
+
+Elimination = namedtuple('Elimination', ['index', 'name', 'reason'])
+
+UNUSED_DECLARATION = "unused declaration"
+DEAD_INITIALIZER = "dead initializer"
+DEAD_ASSIGNMENT = "dead assignment"
+UNUSED_EXPRESSION = "unused expression"
+
+
+class EliminationReport:
+    """
+    The statements removed or simplified by eliminate_dead_stores.
+
+    Attributes:
+        eliminations (list): An Elimination (statement index, variable name, reason) per changed statement.
+    """
+
+    def __init__(self):
+        self.eliminations = []
+
+    def add(self, index, name, reason):
+        self.eliminations.append(Elimination(index, name, reason))
+
+    def __len__(self):
+        return len(self.eliminations)
+
+    def __str__(self) -> str:
+        lines = [f"{len(self.eliminations)} statements eliminated"]
+        for elimination in sorted(self.eliminations):
+            name = f" '{elimination.name}'" if elimination.name is not None else ""
+            lines.append(f"[statement {elimination.index}] {elimination.reason}{name}")
+        return "\n".join(lines)
+
+
+def eliminate_dead_stores(block: Block, inputs: Iterable[str] = ()):
+    """
+    Remove the stores that are never read from a program, using a def-use (liveness) analysis.
+
+    A forward pass finds the statements that fail on an undefined or already defined variable and the
+    expressions that can have effects (raise or assign). A backward pass then tracks the variables that
+    are read before being written again, and:
+      - removes declarations without effects whose variable is never mentioned again
+      - drops initializers without effects of declarations whose value is overwritten before being read,
+        keeping the declaration itself so later assignments still find the variable defined
+      - removes assignments without effects whose value is overwritten before being read
+      - removes expression statements without effects
+    Prints and expressions that can raise are always kept. The final environment of the optimized
+    program may lack the eliminated variables or values.
+
+    :param block: The root Block of the program
+    :param inputs: The names of the variables that are bound when the program starts
+    :return: The optimized Block and the EliminationReport
+    """
+    statements = list(block.statements)
+    variable_types = {name: UNKNOWN for name in inputs}
+
+    # forward pass: which statements certainly fail and which expressions can have effects
+    fails = [False] * len(statements)
+    effects = [True] * len(statements)
+    for idx, statement in enumerate(statements):
+        if isinstance(statement, VariableDeclaration):
+            if statement.name in variable_types:
+                fails[idx] = True
+                continue
+            value_type = UNKNOWN
+            if statement.initializer:
+                value_type, effects[idx] = analyze_expression(statement.initializer, variable_types)
+            else:
+                effects[idx] = False
+            variable_types[statement.name] = value_type
+        elif isinstance(statement, Assignment):
+            value_type, effects[idx] = analyze_expression(statement.value, variable_types)
+            if statement.name in variable_types:
+                variable_types[statement.name] = value_type
+            else:
+                fails[idx] = True
+        elif isinstance(statement, PrintStatement):
+            analyze_expression(statement.expression, variable_types)
+        else:
+            _, effects[idx] = analyze_expression(statement, variable_types)
+
+    # backward pass: live holds the variables read before being written again,
+    # mentioned holds every variable that a later statement reads, writes or declares
+    report = EliminationReport()
+    live, mentioned = set(), set()
+    optimized = []
+    for idx in range(len(statements) - 1, -1, -1):
+        statement = statements[idx]
+        if isinstance(statement, VariableDeclaration):
+            if fails[idx]:
+                # execution stops here, nothing after it is reached
+                live, mentioned = set(), {statement.name}
+                optimized.append(statement)
+                continue
+            if statement.name not in live and not effects[idx]:
+                if statement.name not in mentioned:
+                    report.add(idx, statement.name, UNUSED_DECLARATION)
+                    continue
+                if statement.initializer:
+                    report.add(idx, statement.name, DEAD_INITIALIZER)
+                    statement = VariableDeclaration(name=statement.name, initializer=None)
+            live.discard(statement.name)
+            mentioned.add(statement.name)
+            if statement.initializer:
+                reads, writes = variable_names(statement.initializer)
+                live |= reads
+                mentioned |= reads | writes
+        elif isinstance(statement, Assignment):
+            reads, writes = variable_names(statement.value)
+            if fails[idx]:
+                live, mentioned = reads, reads | writes | {statement.name}
+                optimized.append(statement)
+                continue
+            if statement.name not in live and not effects[idx]:
+                report.add(idx, statement.name, DEAD_ASSIGNMENT)
+                continue
+            live.discard(statement.name)
+            live |= reads
+            mentioned |= reads | writes | {statement.name}
+        elif isinstance(statement, PrintStatement):
+            reads, writes = variable_names(statement.expression)
+            live |= reads
+            mentioned |= reads | writes
+        else:
+            if not effects[idx]:
+                report.add(idx, None, UNUSED_EXPRESSION)
+                continue
+            reads, writes = variable_names(statement)
+            live |= reads
+            mentioned |= reads | writes
+        optimized.append(statement)
+
+    optimized.reverse()
+    return Block(optimized), report
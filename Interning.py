@@ -0,0 +1,177 @@
+from ASTNodes import BinaryOperation, UnaryOperation, Literal, Identifier, iter_child_nodes
+from Interpreter import Interpreter
+from Parser import Parser
+from StaticAnalysis import variable_names
+
+# The expression nodes that are shared between structurally identical subtrees
+INTERNED_TYPES = (Literal, Identifier, BinaryOperation, UnaryOperation)
+
+MISSING = object()
+
+
+class InterningParser(Parser):
+    """
+    A parser that hash-conses expression nodes: structurally identical expressions are built once and shared.
+    Children are interned before their parents, so two subtrees are identical exactly when their node
+    types, scalar fields and (already shared) child nodes are the same.
+    Statements and assignments are never shared.
+    """
+
+    def __init__(self, tokens):
+        """
+        Initialize the parser with a list of tokens and an empty intern table.
+
+        :param tokens: The list of tokens to parse
+        """
+        super().__init__(tokens)
+        self.interned = {}
+
+    def make_node(self, node_type, **fields):
+        """
+        Return the shared node identical to the requested one, creating it the first time.
+
+        :param node_type: The class of the node
+        :param fields: The fields of the node
+        :return: The shared node
+        """
+        if node_type not in INTERNED_TYPES:
+            return node_type(**fields)
+        key = (node_type, *fields.values())
+        node = self.interned.get(key)
+        if node is None:
+            node = self.interned[key] = node_type(**fields)
+        return node
+
+
+def shared_subtrees(root):
+    """
+    Find the operation nodes that are referenced more than once in a hash-consed AST.
+
+    :param root: The root node of the AST
+    :return: A set of the shared BinaryOperation and UnaryOperation nodes
+    """
+    references = {}
+    visited = set()
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        for child in iter_child_nodes(node):
+            references[child] = references.get(child, 0) + 1
+            if child not in visited:
+                visited.add(child)
+                pending.append(child)
+    return {node for node, count in references.items()
+            if count > 1 and isinstance(node, (BinaryOperation, UnaryOperation))}
+
+
+class MemoizingInterpreter(Interpreter):
+    """
+    An interpreter that caches the values of shared pure subtrees of a hash-consed AST.
+    A cached value is dropped as soon as a variable its subtree reads is declared or assigned.
+    Subtrees containing assignments are never cached, and neither are evaluations that raise.
+
+    Attributes:
+        hits (int): The number of evaluations answered from the cache.
+        misses (int): The number of evaluations of shared subtrees that were computed.
+    """
+
+    def __init__(self, output=None):
+        """
+        Initialize the interpreter with an empty environment and cache.
+
+        :param output: The stream to print to, sys.stdout when None
+        """
+        super().__init__(output=output)
+        self.shared = set()
+        self.reads = {}
+        self.cache = {}
+        self.dependents = {}
+        self.hits = 0
+        self.misses = 0
+
+    def interpret(self, node):
+        """
+        Find the shared pure subtrees of the AST, then interpret it.
+
+        :param node: The root node of the AST to interpret
+        :return: INTERPRETER_SUCCESS if execution was successful, INTERPRETER_ERROR otherwise
+        """
+        for subtree in shared_subtrees(node):
+            reads, writes = variable_names(subtree)
+            if not writes:
+                self.shared.add(subtree)
+                self.reads[subtree] = reads
+        return super().interpret(node)
+
+    def evaluate_binary_operation(self, node):
+        """
+        Evaluate a binary operation, answering shared subtrees from the cache.
+
+        :param node: The BinaryOperation node to evaluate
+        :return: The result of the binary operation
+        """
+        if node not in self.shared:
+            return super().evaluate_binary_operation(node)
+        value = self.cache.get(node, MISSING)
+        if value is MISSING:
+            value = super().evaluate_binary_operation(node)
+            self.store(node, value)
+        else:
+            self.hits += 1
+        return value
+
+    def evaluate_unary_operation(self, node):
+        """
+        Evaluate a unary operation, answering shared subtrees from the cache.
+
+        :param node: The UnaryOperation node to evaluate
+        :return: The result of the unary operation
+        """
+        if node not in self.shared:
+            return super().evaluate_unary_operation(node)
+        value = self.cache.get(node, MISSING)
+        if value is MISSING:
+            value = super().evaluate_unary_operation(node)
+            self.store(node, value)
+        else:
+            self.hits += 1
+        return value
+
+    def store(self, node, value):
+        """
+        Cache the value of a shared subtree and register it with the variables it reads.
+
+        :param node: The shared node
+        :param value: The value of the node
+        """
+        self.misses += 1
+        self.cache[node] = value
+        for name in self.reads[node]:
+            self.dependents.setdefault(name, set()).add(node)
+
+    def invalidate(self, name):
+        """
+        Drop the cached values of the subtrees reading a variable.
+
+        :param name: The name of the written variable
+        """
+        for node in self.dependents.pop(name, ()):
+            self.cache.pop(node, None)
+
+    def execute_variable_declaration(self, node):
+        """
+        Execute a variable declaration and drop the cached values reading the variable.
+
+        :param node: The VariableDeclaration node to execute
+        """
+        super().execute_variable_declaration(node)
+        self.invalidate(node.name)
+
+    def execute_assignment(self, node):
+        """
+        Execute an assignment and drop the cached values reading the variable.
+
+        :param node: The Assignment node to execute
+        """
+        super().execute_assignment(node)
+        self.invalidate(node.name)
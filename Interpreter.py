@@ -9,16 +9,20 @@ class Interpreter:
 
     Attributes:
         environment (dict): A dictionary to store variable values during execution.
+        output: The stream print statements and runtime errors are written to (sys.stdout when None).
     """
 
     INTERPRETER_SUCCESS = 0
     INTERPRETER_ERROR = 3
 
-    def __init__(self):
+    def __init__(self, output=None):
         """
         Initialize the interpreter with an empty environment.
+
+        :param output: The stream to print to, sys.stdout when None
         """
         self.environment = {}  # A dictionary to store variable values
+        self.output = output
 
     def interpret(self, node):
         """
@@ -31,7 +35,7 @@ class Interpreter:
             self._interpret(node)
             return Interpreter.INTERPRETER_SUCCESS
         except Exception as e:
-            print(f"Runtime error: {e}")
+            print(f"Runtime error: {e}", file=self.output)
             return Interpreter.INTERPRETER_ERROR
 
     def _interpret(self, node):
@@ -56,10 +60,19 @@ class Interpreter:
         elif isinstance(node, Literal):
             return node.value
         elif isinstance(node, Identifier):
-            return self.environment.get(node.name, None)
+            return self.evaluate_identifier(node)
         else:
             raise Exception(f"Unsupported AST node type: {type(node).__name__}")
 
+    def evaluate_identifier(self, node):
+        """
+        Evaluate an identifier by reading its variable, undefined variables evaluate to None.
+
+        :param node: The Identifier node to evaluate
+        :return: The value of the variable
+        """
+        return self.environment.get(node.name, None)
+
     def execute_block(self, block):
         """
         Execute each statement in the block.
@@ -91,7 +104,7 @@ class Interpreter:
         :param node: The PrintStatement node to execute
         """
         value = self._interpret(node.expression)
-        print(value)
+        print(value, file=self.output)
 
     def execute_assignment(self, node):
         """
@@ -116,7 +129,18 @@ class Interpreter:
         """
         left = self._interpret(node.left)
         right = self._interpret(node.right)
+        return self.apply_binary_operator(node.operator, left, right)
+
+    def apply_binary_operator(self, operator, left, right):
+        """
+        Apply a binary operator to already evaluated operands.
 
+        :param operator: The token type of the operator
+        :param left: The value of the left operand
+        :param right: The value of the right operand
+        :return: The result of the binary operation
+        :raises Exception: If the operation is unsupported or encounters an error
+        """
         # Convert numeric strings to float if possible
         if isinstance(left, str):
             try:
@@ -131,18 +155,18 @@ class Interpreter:
                 pass
 
         # Perform the binary operation
-        if node.operator == TokenType.PLUS:
+        if operator == TokenType.PLUS:
             return left + right
-        elif node.operator == TokenType.MINUS:
+        elif operator == TokenType.MINUS:
             return left - right
-        elif node.operator == TokenType.STAR:
+        elif operator == TokenType.STAR:
             return left * right
-        elif node.operator == TokenType.SLASH:
+        elif operator == TokenType.SLASH:
             if right == 0:
                 raise Exception("Division by zero.")
             return left / right
         else:
-            raise Exception(f"Unsupported binary operator: {node.operator}")
+            raise Exception(f"Unsupported binary operator: {operator}")
 
     def evaluate_unary_operation(self, node):
         """
@@ -153,7 +177,17 @@ class Interpreter:
         :raises Exception: If the operation is unsupported or encounters an error
         """
         operand = self._interpret(node.operand)
+        return self.apply_unary_operator(node.operator, operand)
+
+    def apply_unary_operator(self, operator, operand):
+        """
+        Apply a unary operator to an already evaluated operand.
 
+        :param operator: The token type of the operator
+        :param operand: The value of the operand
+        :return: The result of the unary operation
+        :raises Exception: If the operation is unsupported or encounters an error
+        """
         # Convert numeric string to float if possible
         if isinstance(operand, str):
             try:
@@ -162,9 +196,9 @@ class Interpreter:
                 raise Exception(f"Cannot perform unary operation on a non-numeric string: '{operand}'")
 
         # Perform the unary operation
-        if node.operator == TokenType.MINUS:
+        if operator == TokenType.MINUS:
             return -operand
-        elif node.operator == TokenType.BANG:
+        elif operator == TokenType.BANG:
             return not operand
         else:
-            raise Exception(f"Unsupported unary operator: {node.operator}")
+            raise Exception(f"Unsupported unary operator: {operator}")
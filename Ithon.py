@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 import sys
-from Processes import tokenization, parsing, interpreting
+from Processes import (tokenization, parsing, interpreting, transpiling, transpiled_interpreting,
+                       optimized_interpreting, checkpointed_interpreting, batch_interpreting, JSON_FORMAT)
+from ByteTokenizer import split_lines
+from LazyInterpreter import LazyInterpreter
 
 PROGRAM_ERROR = 1
 
 def main():
     if len(sys.argv) < 2:
         print("Usage: Ithon <filename> [optional command]", file=sys.stderr)
-        print("possible commands: [tokenize, parse, execute]")
+        print("possible commands: [tokenize, tokenize-jsonl, parse, parse-json, transpile, execute, execute-transpiled, execute-optimized, execute-parallel, execute-lazy, memprofile [report.json], checkpoint [interval], resume [interval], execute-batch <table.csv>]")
         return PROGRAM_ERROR
 
     filename = sys.argv[1]
@@ -18,18 +21,58 @@ def main():
 
 
     try:
-        with open(filename) as file:
-            file_content = file.readlines()
+        # the source is tokenized from its raw bytes, only the commands working on lines decode it
+        with open(filename, "rb") as file:
+            file_content = file.read()
     except FileNotFoundError:
         print(f"File '{filename}' not found")
         return PROGRAM_ERROR
 
     if command == "tokenize":
         return tokenization(file_content=file_content)
+    elif command == "tokenize-jsonl":
+        return tokenization(file_content=file_content, output_format=JSON_FORMAT)
     elif command == "parse":
         return parsing(file_content=file_content)
+    elif command == "parse-json":
+        return parsing(file_content=file_content, output_format=JSON_FORMAT)
     elif command == "execute":
         return interpreting(file_content=file_content)
+    elif command == "transpile":
+        return transpiling(file_content=file_content)
+    elif command == "execute-transpiled":
+        return transpiled_interpreting(file_content=file_content)
+    elif command == "execute-optimized":
+        return optimized_interpreting(file_content=file_content)
+    elif command == "execute-parallel":
+        # imported here, so the other commands don't load multiprocessing
+        from ParallelInterpreter import ParallelInterpreter
+        return interpreting(file_content=file_content, interpreter=ParallelInterpreter())
+    elif command == "execute-lazy":
+        interpreter = LazyInterpreter()
+        status = interpreting(file_content=file_content, interpreter=interpreter)
+        print(f"initializers: created={interpreter.created} forced={interpreter.forced} "
+              f"never_forced={interpreter.never_forced}", file=sys.stderr)
+        return status
+    elif command in ("checkpoint", "resume"):
+        # imported here, so the other commands don't load hashlib and json
+        from Checkpointing import CHECKPOINT_SUFFIX
+        file_content = split_lines(file_content)
+        interval = sys.argv[3] if len(sys.argv) > 3 else None
+        return checkpointed_interpreting(file_content=file_content, checkpoint_path=filename + CHECKPOINT_SUFFIX,
+                                         interval=interval, resume=command == "resume")
+    elif command == "execute-batch":
+        if len(sys.argv) < 4:
+            print("Usage: Ithon <filename> execute-batch <table.csv>", file=sys.stderr)
+            return PROGRAM_ERROR
+        return batch_interpreting(file_content=file_content, table_path=sys.argv[3])
+    elif command == "memprofile":
+        # imported here, so the other commands don't load tracemalloc
+        from MemoryProfiler import memory_profiling
+        if len(sys.argv) > 3:
+            with open(sys.argv[3], "w") as report:
+                return memory_profiling(file_content=file_content, report=report)
+        return memory_profiling(file_content=file_content)
 
     print(f"Unknown command: {command}", file=sys.stderr)
     return PROGRAM_ERROR
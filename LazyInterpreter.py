@@ -0,0 +1,158 @@
+from ASTNodes import Literal, Identifier
+from Interpreter import Interpreter
+from StaticAnalysis import variable_names
+
+
+class InitializerError(Exception):
+    """Raised when a lazily evaluated initializer fails, naming the declaration it belongs to."""
+    pass
+
+
+class Thunk:
+    """
+    The delayed value of a variable initializer.
+    A thunk captures the values of the variables its initializer reads when it is declared, so forcing it
+    later gives the same value (or error) as evaluating the initializer at the declaration.
+    """
+
+    __slots__ = ('name', 'position', 'node', 'environment', 'value', 'error', 'done')
+
+    def __init__(self, name, position, node, environment):
+        """
+        :param name: The name of the declared variable
+        :param position: The position of the declaration in its block, starting from 1
+        :param node: The initializer expression
+        :param environment: The captured values of the variables the initializer reads
+        """
+        self.name = name
+        self.position = position
+        self.node = node
+        self.environment = environment
+        self.value = None
+        self.error = None
+        self.done = False
+
+
+class LazyInterpreter(Interpreter):
+    """
+    An interpreter that evaluates variable initializers on demand.
+    A declaration stores a Thunk, which is evaluated the first time an identifier reads the variable and
+    cached from then on. Initializers that are never read are never evaluated, so their errors are never
+    raised; an initializer that fails raises an InitializerError naming the declaration every time it is read.
+    Initializers that assign variables are evaluated eagerly.
+
+    Attributes:
+        created (int): The number of thunks created.
+        forced (int): The number of thunks evaluated.
+    """
+
+    def __init__(self, output=None):
+        """
+        Initialize the interpreter with an empty environment.
+
+        :param output: The stream to print to, sys.stdout when None
+        """
+        super().__init__(output=output)
+        self.position = 0
+        self.created = 0
+        self.forced = 0
+
+    @property
+    def never_forced(self):
+        """
+        The number of initializers that were never evaluated.
+        """
+        return self.created - self.forced
+
+    def execute_block(self, block):
+        """
+        Execute each statement in the block, keeping track of the current statement position.
+
+        :param block: The Block node containing the statements to execute
+        """
+        for position, statement in enumerate(block.statements, start=1):
+            self.position = position
+            self._interpret(statement)
+
+    def execute_variable_declaration(self, node):
+        """
+        Execute a variable declaration by storing a thunk of its initializer.
+        Initializers that are literals or identifiers are stored directly.
+
+        :param node: The VariableDeclaration node to execute
+        :raises Exception: If a variable with the same name already exists
+        """
+        if node.name in self.environment:
+            raise Exception(f"Variable '{node.name}' is already defined.")
+
+        initializer = node.initializer
+        if initializer is None:
+            value = None
+        elif isinstance(initializer, Literal):
+            value = initializer.value
+        elif isinstance(initializer, Identifier):
+            # share the thunk of the other variable instead of forcing it
+            value = self.environment.get(initializer.name, None)
+        else:
+            reads, writes = variable_names(initializer)
+            if writes:
+                value = self._interpret(initializer)
+            else:
+                environment = {name: self.environment[name] for name in reads if name in self.environment}
+                value = Thunk(node.name, self.position, initializer, environment)
+                self.created += 1
+        self.environment[node.name] = value
+
+    def evaluate_identifier(self, node):
+        """
+        Evaluate an identifier, forcing the thunk of its variable.
+
+        :param node: The Identifier node to evaluate
+        :return: The value of the variable
+        """
+        value = self.environment.get(node.name, None)
+        if isinstance(value, Thunk):
+            return self.force(value)
+        return value
+
+    def force(self, thunk):
+        """
+        Evaluate a thunk, and the thunks it reads first, without recursing through long declaration chains.
+
+        :param thunk: The Thunk to evaluate
+        :return: The value of the thunk
+        :raises InitializerError: If the initializer, or one it reads, fails
+        """
+        pending = [thunk]
+        while pending:
+            current = pending[-1]
+            if current.done:
+                pending.pop()
+                continue
+            dependencies = [value for value in current.environment.values()
+                            if isinstance(value, Thunk) and not value.done]
+            if dependencies:
+                pending.extend(dependencies)
+                continue
+
+            pending.pop()
+            saved = self.environment
+            self.environment = current.environment
+            try:
+                current.value = self._interpret(current.node)
+            except InitializerError as e:
+                current.error = e
+            except Exception as e:
+                current.error = InitializerError(
+                    f"{e} (in the initializer of '{current.name}', statement {current.position})")
+            finally:
+                self.environment = saved
+            # the captured values are no longer needed
+            current.node = None
+            current.environment = None
+            current.done = True
+            self.forced += 1
+
+        if thunk.error is not None:
+            raise thunk.error
+        return thunk.value
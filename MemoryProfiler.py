@@ -0,0 +1,143 @@
+import json
+import sys
+import time
+import tracemalloc
+from typing import List, Union
+from ASTNodes import walk
+from Tokenizer import Tokenizer
+from Parser import Parser
+from Interpreter import Interpreter
+from Processes import make_tokenizer
+
+REPORT_VERSION = 1
+LARGEST_VALUES = 10
+
+
+def deep_size(obj, seen=None) -> int:
+    """
+    Get the size of an object together with everything it references.
+    Objects referenced more than once are counted once.
+
+    :param obj: The object to measure
+    :param seen: The ids of the objects already counted
+    :return: The size in bytes
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                pending.append(obj.__dict__)
+            for slot in getattr(type(obj), "__slots__", ()):
+                if hasattr(obj, slot):
+                    pending.append(getattr(obj, slot))
+    return size
+
+
+class MemoryProfile:
+    """
+    Records the memory used by each phase of a run, measured with tracemalloc.
+    Sizes are relative to the traced memory when the profile was created.
+    """
+
+    def __init__(self):
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        self.previous = self.baseline
+        self.phases = []
+        self.start = time.perf_counter()
+        tracemalloc.reset_peak()
+
+    def phase(self, name):
+        """
+        Record the end of a phase and start measuring the next one.
+
+        :param name: The name of the phase that ended
+        :return: The number of bytes the phase added to the retained memory
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        now = time.perf_counter()
+        growth = current - self.previous
+        self.phases.append({
+            "phase": name,
+            "seconds": now - self.start,
+            "retained_bytes": current - self.baseline,
+            "growth_bytes": growth,
+            "peak_bytes": peak - self.baseline,
+        })
+        self.previous = current
+        self.start = now
+        tracemalloc.reset_peak()
+        return growth
+
+
+def memory_profiling(file_content: Union[List[str], bytes], report=None) -> int:
+    """
+    Run the program like Processes.interpreting while profiling its memory.
+    The report is written as a single JSON document.
+
+    :param file_content: The lines of the program, or its raw bytes
+    :param report: The stream to write the JSON report to, sys.stderr when None
+    :return: The status code of the run
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        profile = MemoryProfile()
+        result = {"version": REPORT_VERSION, "python": sys.version.split()[0]}
+
+        tokenizer = make_tokenizer(file_content)
+        status = tokenizer.tokenize()
+        token_bytes = profile.phase("tokenize")
+        result["tokens"] = len(tokenizer.tokens)
+        result["bytes_per_token"] = token_bytes / max(len(tokenizer.tokens), 1)
+
+        parser = None
+        interpreter = None
+        if status == Tokenizer.TOKENIZER_SUCCESS:
+            parser = Parser(tokenizer.tokens)
+            status = parser.parse()
+            ast_bytes = profile.phase("parse")
+            if status == Parser.PARSER_SUCCESS:
+                nodes = sum(1 for _ in walk(parser.ast))
+                result["ast_nodes"] = nodes
+                result["bytes_per_ast_node"] = ast_bytes / max(nodes, 1)
+
+                interpreter = Interpreter()
+                status = interpreter.interpret(parser.ast)
+                profile.phase("interpret")
+        result["status"] = status
+        result["phases"] = profile.phases
+
+        # the sizes are measured after the run, so they don't show up in the phases
+        result["structures"] = {
+            "file_content": deep_size(file_content),
+            "tokens": deep_size(tokenizer.tokens),
+            "ast": deep_size(parser.ast) if parser is not None and parser.ast is not None else 0,
+            "environment": deep_size(interpreter.environment) if interpreter is not None else 0,
+        }
+        if interpreter is not None:
+            sizes = sorted(((deep_size(value), name, type(value).__name__)
+                            for name, value in interpreter.environment.items()), reverse=True)
+            result["largest_values"] = [{"name": name, "type": value_type, "bytes": size}
+                                        for size, name, value_type in sizes[:LARGEST_VALUES]]
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    output = report if report is not None else sys.stderr
+    json.dump(result, output, indent=2)
+    output.write("\n")
+    return status
@@ -0,0 +1,202 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from ASTNodes import (Block, PrintStatement, VariableDeclaration,
+                      BinaryOperation, UnaryOperation, Literal, Identifier, Assignment)
+from Interpreter import Interpreter
+from StaticAnalysis import variable_names
+
+
+# The expressions of the block a worker process evaluates, loaded once when the process starts
+worker_expressions = None
+
+
+def load_expressions(expressions):
+    """
+    Initialize a worker process with the expressions of the block, so tasks only carry statement indexes.
+
+    :param expressions: The expression evaluated by each statement
+    """
+    global worker_expressions
+    worker_expressions = expressions
+
+
+def evaluate_chunk(chunk):
+    """
+    Evaluate a chunk of independent expressions in a worker.
+
+    :param chunk: A list of (index, expression, environment) tuples, the environment holding the variables read;
+                  the expression is None when the worker was loaded with the expressions
+    :return: A list of (index, value, error) tuples
+    """
+    results = []
+    for index, expression, environment in chunk:
+        if expression is None:
+            expression = worker_expressions[index]
+        interpreter = Interpreter()
+        interpreter.environment = environment
+        try:
+            results.append((index, interpreter._interpret(expression), None))
+        except Exception as e:
+            results.append((index, None, e))
+    return results
+
+
+def free_threaded():
+    """
+    Check if the running Python executes threads in parallel (a free-threaded build with the GIL disabled).
+
+    :return: True if threads run in parallel, otherwise False
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class ParallelInterpreter(Interpreter):
+    """
+    An interpreter that evaluates the independent expressions of a block concurrently on a worker pool.
+
+    Since a block is straight-line code, the statement producing the value of every variable read is known
+    in advance. Statements are grouped in levels, a statement's level being one more than the level of the
+    statements producing the variables it reads, and the expressions of each level are evaluated together
+    on the pool. The statements are then committed one by one in program order: the definition checks, the
+    environment updates, the prints and the errors all happen exactly as in sequential execution.
+
+    Blocks containing assignments nested in expressions run sequentially.
+    """
+
+    def __init__(self, executor=None, max_workers=None, output=None):
+        """
+        Initialize the interpreter with an empty environment.
+
+        :param executor: The concurrent.futures executor to evaluate on; by default a pool of threads on
+                         free-threaded Python and a pool of processes otherwise, created for each block.
+                         The processes of the default pool receive the block once, when they start
+        :param max_workers: The number of workers of the default pool
+        :param output: The stream to print to, sys.stdout when None
+        """
+        super().__init__(output=output)
+        self.executor = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def execute_block(self, block):
+        """
+        Evaluate the expressions of the block level by level on the pool, then commit the statements in order.
+
+        :param block: The Block node containing the statements to execute
+        """
+        statements = block.statements
+        expressions = []
+        reads = []
+        for statement in statements:
+            if isinstance(statement, VariableDeclaration):
+                expression = statement.initializer
+            elif isinstance(statement, Assignment):
+                expression = statement.value
+            elif isinstance(statement, PrintStatement):
+                expression = statement.expression
+            elif isinstance(statement, Block):
+                return super().execute_block(block)
+            else:
+                expression = statement
+            names = set()
+            if expression is not None:
+                names, writes = variable_names(expression)
+                if writes:
+                    return super().execute_block(block)
+            expressions.append(expression)
+            reads.append(names)
+
+        levels = self.schedule(statements, reads)
+        if self.executor is not None:
+            values, errors = self.evaluate(expressions, reads, levels, self.executor, preloaded=False)
+        elif free_threaded():
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                values, errors = self.evaluate(expressions, reads, levels, executor, preloaded=False)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=load_expressions,
+                                     initargs=(expressions,)) as executor:
+                values, errors = self.evaluate(expressions, reads, levels, executor, preloaded=True)
+
+        for idx, statement in enumerate(statements):
+            if isinstance(statement, VariableDeclaration):
+                if statement.name in self.environment:
+                    raise Exception(f"Variable '{statement.name}' is already defined.")
+                if idx in errors:
+                    raise errors[idx]
+                self.environment[statement.name] = values.get(idx)
+            else:
+                if idx in errors:
+                    raise errors[idx]
+                if isinstance(statement, Assignment):
+                    if statement.name not in self.environment:
+                        raise Exception(f"Variable '{statement.name}' is not defined.")
+                    self.environment[statement.name] = values[idx]
+                elif isinstance(statement, PrintStatement):
+                    print(values[idx], file=self.output)
+
+    def schedule(self, statements, reads):
+        """
+        Build the dependency graph of the statements and group them in levels.
+        The producers of a statement are the latest earlier statements writing the variables it reads.
+
+        :param statements: The statements of the block
+        :param reads: The names of the variables read by each statement
+        :return: A list per level of (statement index, {variable name: producer index}) tuples
+        """
+        levels = []
+        statement_levels = []
+        writers = {}
+        for idx, statement in enumerate(statements):
+            producers = {name: writers[name] for name in reads[idx] if name in writers}
+            level = max((statement_levels[producer] + 1 for producer in producers.values()), default=0)
+            statement_levels.append(level)
+            if not isinstance(statement, VariableDeclaration) or statement.initializer is not None:
+                while level >= len(levels):
+                    levels.append([])
+                levels[level].append((idx, producers))
+            if isinstance(statement, (VariableDeclaration, Assignment)):
+                writers[statement.name] = idx
+        return levels
+
+    def evaluate(self, expressions, reads, levels, executor, preloaded):
+        """
+        Evaluate the expressions level by level, the operations of a level concurrently on the pool.
+
+        :param expressions: The expression evaluated by each statement
+        :param reads: The names of the variables read by each statement
+        :param levels: The levels built by schedule
+        :param executor: The executor to evaluate on
+        :param preloaded: True if the workers were loaded with the expressions by load_expressions
+        :return: The value of each evaluated statement and the error of each failed one, by statement index
+        """
+        values, errors = {}, {}
+        for level in levels:
+            tasks = []
+            for idx, producers in level:
+                if any(producer in errors for producer in producers.values()):
+                    # a producer fails, so execution stops before this statement
+                    continue
+                environment = {name: values.get(producer) for name, producer in producers.items()}
+                for name in reads[idx]:
+                    if name not in producers and name in self.environment:
+                        environment[name] = self.environment[name]
+                tasks.append((idx, expressions[idx], environment))
+
+            inline = [task for task in tasks if isinstance(task[1], (Literal, Identifier))]
+            pooled = [(idx, None if preloaded else expression, environment)
+                      for idx, expression, environment in tasks
+                      if isinstance(expression, (BinaryOperation, UnaryOperation))]
+            chunks = [evaluate_chunk(inline)]
+            if pooled:
+                chunk_size = max(1, len(pooled) // (self.max_workers * 4))
+                futures = [executor.submit(evaluate_chunk, pooled[start:start + chunk_size])
+                           for start in range(0, len(pooled), chunk_size)]
+                chunks.extend(future.result() for future in futures)
+            for results in chunks:
+                for idx, value, error in results:
+                    if error is None:
+                        values[idx] = value
+                    else:
+                        errors[idx] = error
+        return values, errors
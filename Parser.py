@@ -20,6 +20,17 @@ class Parser:
         self.tokens = tokens
         self.current = 0
         self.ast = None  # To store the parsed AST
+        self.error = None  # To store the message of the last parsing error
+
+    def make_node(self, node_type, **fields):
+        """
+        Create an AST node. Subclasses can override this to control how nodes are allocated.
+
+        :param node_type: The class of the node
+        :param fields: The fields of the node
+        :return: The new node
+        """
+        return node_type(**fields)
 
     def is_at_end(self):
         """
@@ -29,70 +40,87 @@ class Parser:
         """
         return self.peek().token_type == TokenType.EOF
 
-    def parse(self):
+    def parse(self, output=None):
         """
         Parse the entire token stream to produce an AST.
 
+        :param output: The stream parsing errors are written to, sys.stdout when None
         :return: Parser.PARSER_SUCCESS if parsing was successful, Parser.PARSER_ERROR otherwise
         """
         try:
             statements = []
             while not self.is_at_end():
                 statements.append(self.declaration())
-            self.ast = Block(statements)
+            self.ast = self.make_node(Block, statements=statements)
             return Parser.PARSER_SUCCESS
         except Exception as e:
             self.ast = None
-            print(f"Parsing error: {e}")
+            self.error = str(e)
+            print(f"Parsing error: {e}", file=output)
             return Parser.PARSER_ERROR
 
     def print_ast(self, output):
         """
         Print the formatted AST to the provided output.
+        The tree is written piece by piece, so no formatted copy of it is ever held in memory.
 
         :param output: The output stream (e.g., sys.stdout) to write the formatted AST to
         """
-        def format_ast(node, indent=0):
-            """
-            Format the AST node as a string with indentation for printing.
-
-            :param node: The AST node to format
-            :param indent: The current level of indentation
-            :return: A formatted string representation of the AST node
-            """
-            indent_str = " " * indent
-            if isinstance(node, Block):
-                formatted_statements = ",\n".join(format_ast(stmt, indent + 4) for stmt in node.statements)
-                return f"Block([\n{indent_str}    {formatted_statements}\n{indent_str}])"
-            elif isinstance(node, VariableDeclaration):
-                initializer = format_ast(node.initializer, indent + 4) if node.initializer else "None"
-                return f"VariableDeclaration(\n{indent_str}    name='{node.name}',\n{indent_str}    initializer={initializer}\n{indent_str})"
-            elif isinstance(node, PrintStatement):
-                expression = format_ast(node.expression, indent + 4)
-                return f"PrintStatement(\n{indent_str}    expression={expression}\n{indent_str})"
-            elif isinstance(node, Assignment):
-                value = format_ast(node.value, indent + 4)
-                return f"Assignment(\n{indent_str}    name='{node.name}',\n{indent_str}    value={value}\n{indent_str})"
-            elif isinstance(node, BinaryOperation):
-                left = format_ast(node.left, indent + 4)
-                right = format_ast(node.right, indent + 4)
-                return f"BinaryOperation(\n{indent_str}    left={left},\n{indent_str}    operator='{node.operator}',\n{indent_str}    right={right}\n{indent_str})"
-            elif isinstance(node, UnaryOperation):
-                operand = format_ast(node.operand, indent + 4)
-                return f"UnaryOperation(\n{indent_str}    operator='{node.operator}',\n{indent_str}    operand={operand}\n{indent_str})"
-            elif isinstance(node, Literal):
-                return f"Literal({node.value})"
-            elif isinstance(node, Identifier):
-                return f"Identifier('{node.name}')"
-            else:
-                raise Exception(f"Unknown AST node type: {type(node).__name__}")
-
         if self.ast is not None:
-            formatted_ast = format_ast(self.ast)
-            output.write(formatted_ast + "\n")
+            self.write_ast(self.ast, output)
+            output.write("\n")
         else:
             output.write("No valid AST to print.\n")
 
+    def write_ast(self, node, output, indent=0):
+        """
+        Write the AST node to the output with indentation for printing.
+
+        :param node: The AST node to write
+        :param output: The output stream to write to
+        :param indent: The current level of indentation
+        """
+        write = output.write
+        indent_str = " " * indent
+        if isinstance(node, Block):
+            write(f"Block([\n{indent_str}    ")
+            for idx, stmt in enumerate(node.statements):
+                if idx:
+                    write(",\n")
+                self.write_ast(stmt, output, indent + 4)
+            write(f"\n{indent_str}])")
+        elif isinstance(node, VariableDeclaration):
+            write(f"VariableDeclaration(\n{indent_str}    name='{node.name}',\n{indent_str}    initializer=")
+            if node.initializer:
+                self.write_ast(node.initializer, output, indent + 4)
+            else:
+                write("None")
+            write(f"\n{indent_str})")
+        elif isinstance(node, PrintStatement):
+            write(f"PrintStatement(\n{indent_str}    expression=")
+            self.write_ast(node.expression, output, indent + 4)
+            write(f"\n{indent_str})")
+        elif isinstance(node, Assignment):
+            write(f"Assignment(\n{indent_str}    name='{node.name}',\n{indent_str}    value=")
+            self.write_ast(node.value, output, indent + 4)
+            write(f"\n{indent_str})")
+        elif isinstance(node, BinaryOperation):
+            write(f"BinaryOperation(\n{indent_str}    left=")
+            self.write_ast(node.left, output, indent + 4)
+            write(f",\n{indent_str}    operator='{node.operator}',\n{indent_str}    right=")
+            self.write_ast(node.right, output, indent + 4)
+            write(f"\n{indent_str})")
+        elif isinstance(node, UnaryOperation):
+            write(f"UnaryOperation(\n{indent_str}    operator='{node.operator}',\n{indent_str}    operand=")
+            self.write_ast(node.operand, output, indent + 4)
+            write(f"\n{indent_str})")
+        elif isinstance(node, Literal):
+            write(f"Literal({node.value})")
+        elif isinstance(node, Identifier):
+            write(f"Identifier('{node.name}')")
+        else:
+            raise Exception(f"Unknown AST node type: {type(node).__name__}")
+
     def declaration(self):
         """
         Parse a variable declaration or a statement.
@@ -113,7 +141,7 @@ class Parser:
         initializer = None
         if self.match(TokenType.EQUAL):
             initializer = self.expression()
-        return VariableDeclaration(name=name.lexeme, initializer=initializer)
+        return self.make_node(VariableDeclaration, name=name.lexeme, initializer=initializer)
 
     def statement(self):
         """
@@ -132,7 +160,7 @@ class Parser:
         :return: A PrintStatement node representing the parsed print statement
         """
         expr = self.expression()
-        return PrintStatement(expr)
+        return self.make_node(PrintStatement, expression=expr)
 
     def block(self):
         """
@@ -144,7 +172,7 @@ class Parser:
         while not self.check(TokenType.RIGHT_BRACE) and not self.is_at_end():
             statements.append(self.declaration())
         self.consume(TokenType.RIGHT_BRACE, "Expect '}' after block.")
-        return Block(statements)
+        return self.make_node(Block, statements=statements)
 
     def expression_statement(self):
         """
@@ -174,7 +202,7 @@ class Parser:
             equals = self.previous()
             value = self.assignment()
             if isinstance(expr, Identifier):
-                return Assignment(expr.name, value)
+                return self.make_node(Assignment, name=expr.name, value=value)
             raise Exception(f"Invalid assignment target at token {equals.lexeme}.")
         return expr
 
@@ -188,7 +216,7 @@ class Parser:
         while self.match(TokenType.PLUS, TokenType.MINUS):
             operator = self.previous().token_type
             right = self.multiplication()
-            expr = BinaryOperation(left=expr, operator=operator, right=right)
+            expr = self.make_node(BinaryOperation, left=expr, operator=operator, right=right)
         return expr
 
     def multiplication(self):
@@ -201,7 +229,7 @@ class Parser:
         while self.match(TokenType.STAR, TokenType.SLASH):
             operator = self.previous().token_type
             right = self.unary()
-            expr = BinaryOperation(left=expr, operator=operator, right=right)
+            expr = self.make_node(BinaryOperation, left=expr, operator=operator, right=right)
         return expr
 
     def unary(self):
@@ -213,7 +241,7 @@ class Parser:
         if self.match(TokenType.BANG, TokenType.MINUS):
             operator = self.previous().token_type
             operand = self.unary()
-            return UnaryOperation(operator=operator, operand=operand)
+            return self.make_node(UnaryOperation, operator=operator, operand=operand)
         return self.primary()
 
     def primary(self):
@@ -223,11 +251,11 @@ class Parser:
         :return: The parsed primary expression node
         """
         if self.match(TokenType.NUMBER):
-            return Literal(self.previous().literal)
+            return self.make_node(Literal, value=self.previous().literal)
         if self.match(TokenType.STRING):
-            return Literal(self.previous().literal)
+            return self.make_node(Literal, value=self.previous().literal)
         if self.match(TokenType.IDENTIFIER):
-            return Identifier(self.previous().lexeme)
+            return self.make_node(Identifier, name=self.previous().lexeme)
         if self.match(TokenType.LEFT_PAREN):
             expr = self.expression()
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
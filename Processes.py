@@ -1,28 +1,55 @@
 import sys
-from typing import List
+from typing import List, Union
 from Tokenizer import Tokenizer
+from ByteTokenizer import ByteTokenizer
 from Parser import Parser
 from Interpreter import Interpreter
+from Transpiler import Transpiler, TranspiledProgram
+from DeadStoreElimination import eliminate_dead_stores
+from Serialization import dump_tokens_jsonl, dump_errors_jsonl, dump_ast_json
 
-def tokenization(file_content: List[str]) -> int:
-    tokenizer = Tokenizer(file_content=file_content)
+TEXT_FORMAT = "text"
+JSON_FORMAT = "json"
+
+def make_tokenizer(file_content: Union[List[str], bytes]) -> Tokenizer:
+    """
+    Create the tokenizer for a source, a ByteTokenizer when it is given as raw bytes.
+
+    :param file_content: The lines of the program, or its raw bytes
+    :return: The tokenizer of the source
+    """
+    if isinstance(file_content, (bytes, bytearray, memoryview)):
+        return ByteTokenizer(file_content)
+    return Tokenizer(file_content=file_content)
+
+def tokenization(file_content: Union[List[str], bytes], output_format: str = TEXT_FORMAT) -> int:
+    tokenizer = make_tokenizer(file_content)
     status = tokenizer.tokenize()
-    tokenizer.print_tokens(sys.stdout, sys.stderr)
+    if output_format == JSON_FORMAT:
+        dump_tokens_jsonl(tokenizer.tokens, sys.stdout)
+        dump_errors_jsonl(tokenizer.errors, sys.stderr)
+    else:
+        tokenizer.print_tokens(sys.stdout, sys.stderr)
     return status
 
-def parsing(file_content: List[str]) -> int:
-    tokenizer = Tokenizer(file_content=file_content)
+def parsing(file_content: Union[List[str], bytes], output_format: str = TEXT_FORMAT) -> int:
+    tokenizer = make_tokenizer(file_content)
     status = tokenizer.tokenize()
     if status == Tokenizer.TOKENIZER_ERROR:
         return status
 
     parser = Parser(tokenizer.tokens)
     status = parser.parse()
-    parser.print_ast(sys.stdout)
+    if output_format == JSON_FORMAT:
+        if parser.ast is not None:
+            dump_ast_json(parser.ast, sys.stdout)
+            sys.stdout.write("\n")
+    else:
+        parser.print_ast(sys.stdout)
     return status
 
-def interpreting(file_content: List[str]) -> int:
-    tokenizer = Tokenizer(file_content=file_content)
+def interpreting(file_content: Union[List[str], bytes], interpreter: Interpreter = None) -> int:
+    tokenizer = make_tokenizer(file_content)
     if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
         return Tokenizer.TOKENIZER_ERROR
 
@@ -30,5 +57,124 @@ def interpreting(file_content: List[str]) -> int:
     if parser.parse() != Parser.PARSER_SUCCESS:
         return Parser.PARSER_ERROR
 
+    if interpreter is None:
+        interpreter = Interpreter()
+    return interpreter.interpret(parser.ast)
+
+def transpiling(file_content: Union[List[str], bytes]) -> int:
+    tokenizer = make_tokenizer(file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        return Tokenizer.TOKENIZER_ERROR
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse() != Parser.PARSER_SUCCESS:
+        return Parser.PARSER_ERROR
+
+    sys.stdout.write(Transpiler().transpile(parser.ast))
+    return Parser.PARSER_SUCCESS
+
+def transpiled_interpreting(file_content: Union[List[str], bytes]) -> int:
+    tokenizer = make_tokenizer(file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        return Tokenizer.TOKENIZER_ERROR
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse() != Parser.PARSER_SUCCESS:
+        return Parser.PARSER_ERROR
+
+    try:
+        program = TranspiledProgram(parser.ast)
+    except Exception as e:
+        print(e, file=sys.stderr)
+        return Interpreter.INTERPRETER_ERROR
+    return program.run()
+
+def optimized_interpreting(file_content: Union[List[str], bytes]) -> int:
+    tokenizer = make_tokenizer(file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        return Tokenizer.TOKENIZER_ERROR
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse() != Parser.PARSER_SUCCESS:
+        return Parser.PARSER_ERROR
+
+    ast, report = eliminate_dead_stores(parser.ast)
+    print(report, file=sys.stderr)
     interpreter = Interpreter()
+    return interpreter.interpret(ast)
+
+def checkpointed_interpreting(file_content: List[str], checkpoint_path: str, interval: str = None,
+                              resume: bool = False) -> int:
+    # imported here, so the other commands don't load hashlib and json
+    from Checkpointing import (CheckpointingInterpreter, DEFAULT_INTERVAL, source_digest, parse_interval,
+                               load_checkpoint)
+
+    if interval is None:
+        interval = DEFAULT_INTERVAL
+    try:
+        every_statements, every_seconds = parse_interval(interval)
+    except ValueError:
+        print(f"Invalid checkpoint interval: {interval}", file=sys.stderr)
+        return Interpreter.INTERPRETER_ERROR
+
+    tokenizer = Tokenizer(file_content=file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        return Tokenizer.TOKENIZER_ERROR
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse() != Parser.PARSER_SUCCESS:
+        return Parser.PARSER_ERROR
+
+    digest = source_digest(file_content)
+    position, environment = 0, {}
+    if resume:
+        try:
+            position, environment = load_checkpoint(checkpoint_path, digest)
+        except FileNotFoundError:
+            print(f"No checkpoint found at '{checkpoint_path}'", file=sys.stderr)
+            return Interpreter.INTERPRETER_ERROR
+        except Exception as e:
+            print(f"Cannot resume: {e}", file=sys.stderr)
+            return Interpreter.INTERPRETER_ERROR
+
+    interpreter = CheckpointingInterpreter(checkpoint_path, digest, every_statements=every_statements,
+                                           every_seconds=every_seconds, position=position)
+    interpreter.environment = environment
     return interpreter.interpret(parser.ast)
+
+def batch_interpreting(file_content: Union[List[str], bytes], table_path: str) -> int:
+    # imported here, so the other commands don't load NumPy
+    from BatchEvaluation import BatchInterpreter, read_csv_columns
+
+    tokenizer = make_tokenizer(file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        return Tokenizer.TOKENIZER_ERROR
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse() != Parser.PARSER_SUCCESS:
+        return Parser.PARSER_ERROR
+
+    try:
+        with open(table_path, newline="") as table:
+            columns = read_csv_columns(table)
+    except FileNotFoundError:
+        print(f"File '{table_path}' not found", file=sys.stderr)
+        return Interpreter.INTERPRETER_ERROR
+    except Exception as e:
+        print(f"Invalid table '{table_path}': {e}", file=sys.stderr)
+        return Interpreter.INTERPRETER_ERROR
+
+    interpreter = BatchInterpreter(columns)
+    result = interpreter.run(parser.ast)
+    # the output of each row is the output of a separate run with the row's bindings
+    write = sys.stdout.write
+    for outputs, error in zip(result.outputs, result.errors):
+        for value in outputs:
+            write(f"{value}\n")
+        if error is not None:
+            write(f"Runtime error: {error}\n")
+    print(f"rows={interpreter.rows} vectorized={interpreter.vectorized} "
+          f"row_statements={interpreter.row_statements}", file=sys.stderr)
+    if any(error is not None for error in result.errors):
+        return Interpreter.INTERPRETER_ERROR
+    return Interpreter.INTERPRETER_SUCCESS
@@ -0,0 +1,101 @@
+import io
+from collections import namedtuple
+from typing import List, Union
+from ASTNodes import Block
+from Tokenizer import Tokenizer
+from Parser import Parser
+from Interpreter import Interpreter
+
+RunResult = namedtuple('RunResult', ['status', 'outputs', 'environment', 'error'])
+
+
+class CompileError(Exception):
+    """Raised when a source can't be tokenized or parsed."""
+
+    def __init__(self, status, errors):
+        """
+        :param status: The status code of the failing phase
+        :param errors: The error messages of the failing phase
+        """
+        super().__init__("\n".join(errors))
+        self.status = status
+        self.errors = errors
+
+
+class RecordingInterpreter(Interpreter):
+    """
+    An interpreter that collects the printed values as Python objects instead of writing them out.
+    """
+
+    def __init__(self, outputs):
+        """
+        :param outputs: The list the printed values are appended to
+        """
+        super().__init__()
+        self.outputs = outputs
+
+    def execute_print_statement(self, node):
+        """
+        Evaluate the expression of a print statement and record its value.
+
+        :param node: The PrintStatement node to execute
+        """
+        self.outputs.append(self._interpret(node.expression))
+
+
+class Program:
+    """
+    A compiled Ithon program that can be run any number of times with different input bindings.
+    A Program is immutable and every run gets its own interpreter, so a single Program can be
+    shared between threads.
+    """
+
+    __slots__ = ('ast',)
+
+    def __init__(self, ast: Block):
+        """
+        :param ast: The root Block of the parsed program
+        """
+        object.__setattr__(self, 'ast', Block(ast.statements))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Program is immutable")
+
+    def run(self, bindings=None) -> RunResult:
+        """
+        Run the program.
+
+        :param bindings: A mapping of variable names to the values they hold when the program starts
+        :return: The status code, the printed values, the final environment and the runtime error message, if any
+        """
+        outputs = []
+        interpreter = RecordingInterpreter(outputs)
+        if bindings:
+            interpreter.environment.update(bindings)
+
+        try:
+            interpreter.execute_block(self.ast)
+        except Exception as e:
+            return RunResult(Interpreter.INTERPRETER_ERROR, outputs, interpreter.environment, str(e))
+        return RunResult(Interpreter.INTERPRETER_SUCCESS, outputs, interpreter.environment, None)
+
+
+def compile(source: Union[str, List[str]]) -> Program:
+    """
+    Tokenize and parse a source once, so it can be run many times.
+
+    :param source: The program source, either as a string or as a list of lines
+    :return: The compiled Program
+    :raises CompileError: If the source can't be tokenized or parsed
+    """
+    file_content = source.splitlines() if isinstance(source, str) else source
+
+    tokenizer = Tokenizer(file_content=file_content)
+    if tokenizer.tokenize() != Tokenizer.TOKENIZER_SUCCESS:
+        raise CompileError(Tokenizer.TOKENIZER_ERROR, [str(err_token) for err_token in tokenizer.errors])
+
+    parser = Parser(tokenizer.tokens)
+    if parser.parse(output=io.StringIO()) != Parser.PARSER_SUCCESS:
+        raise CompileError(Parser.PARSER_ERROR, [f"Parsing error: {parser.error}"])
+
+    return Program(parser.ast)
@@ -0,0 +1,150 @@
+import json
+from typing import List, Iterable
+from ASTNodes import (Block, PrintStatement, VariableDeclaration,
+                      BinaryOperation, UnaryOperation, Literal, Identifier, Assignment)
+from Tokens import Token, ErrorToken
+
+# Machine-readable dump formats for the tokenizer and the parser output.
+#
+# Tokens are written as JSON Lines, one object per token:
+#     {"type": "NUMBER", "lexeme": "5", "literal": "5.0"}
+#
+# The AST is written as a single compact JSON document where every node is an array
+# whose first item is the node type, followed by its fields in constructor order:
+#     ["VariableDeclaration", "a", ["Literal", "5.0"]]
+#
+# Both formats are streamed straight to the output and can be loaded back.
+
+_dumps = json.dumps
+
+
+def dump_tokens_jsonl(tokens: Iterable[Token], output) -> None:
+    """
+    Write the tokens to the output as JSON Lines.
+
+    :param tokens: The tokens to write
+    :param output: The output stream to write to
+    """
+    output.writelines(
+        f'{{"type": {_dumps(token.token_type)}, "lexeme": {_dumps(token.lexeme)}, '
+        f'"literal": {_dumps(token.literal)}}}\n'
+        for token in tokens
+    )
+
+
+def dump_errors_jsonl(errors: Iterable[ErrorToken], output) -> None:
+    """
+    Write the tokenizer errors to the output as JSON Lines.
+
+    :param errors: The error tokens to write
+    :param output: The output stream to write to
+    """
+    output.writelines(
+        f'{{"line": {err_token.line_number}, "error": {_dumps(err_token.error_description)}}}\n'
+        for err_token in errors
+    )
+
+
+def load_tokens_jsonl(lines: Iterable[str]) -> List[Token]:
+    """
+    Load tokens written by dump_tokens_jsonl.
+
+    :param lines: The JSON Lines to load (e.g., an open file)
+    :return: The list of loaded tokens
+    """
+    tokens = []
+    for line in lines:
+        if line.strip():
+            fields = json.loads(line)
+            tokens.append(Token(fields["type"], fields["lexeme"], fields["literal"]))
+    return tokens
+
+
+def dump_ast_json(node, output) -> None:
+    """
+    Write the AST node to the output as compact JSON.
+
+    :param node: The AST node to write
+    :param output: The output stream to write to
+    """
+    write = output.write
+    if node is None:
+        write("null")
+    elif isinstance(node, Block):
+        write('["Block", [')
+        for idx, stmt in enumerate(node.statements):
+            if idx:
+                write(", ")
+            dump_ast_json(stmt, output)
+        write("]]")
+    elif isinstance(node, VariableDeclaration):
+        write(f'["VariableDeclaration", {_dumps(node.name)}, ')
+        dump_ast_json(node.initializer, output)
+        write("]")
+    elif isinstance(node, PrintStatement):
+        write('["PrintStatement", ')
+        dump_ast_json(node.expression, output)
+        write("]")
+    elif isinstance(node, Assignment):
+        write(f'["Assignment", {_dumps(node.name)}, ')
+        dump_ast_json(node.value, output)
+        write("]")
+    elif isinstance(node, BinaryOperation):
+        write('["BinaryOperation", ')
+        dump_ast_json(node.left, output)
+        write(f", {_dumps(node.operator)}, ")
+        dump_ast_json(node.right, output)
+        write("]")
+    elif isinstance(node, UnaryOperation):
+        write(f'["UnaryOperation", {_dumps(node.operator)}, ')
+        dump_ast_json(node.operand, output)
+        write("]")
+    elif isinstance(node, Literal):
+        write(f'["Literal", {_dumps(node.value)}]')
+    elif isinstance(node, Identifier):
+        write(f'["Identifier", {_dumps(node.name)}]')
+    else:
+        raise Exception(f"Unknown AST node type: {type(node).__name__}")
+
+
+def decode_ast(data):
+    """
+    Rebuild an AST node from its decoded JSON representation.
+
+    :param data: The decoded JSON value of a node
+    :return: The rebuilt AST node
+    """
+    if data is None:
+        return None
+
+    node_type = data[0]
+    if node_type == "Block":
+        return Block([decode_ast(stmt) for stmt in data[1]])
+    elif node_type == "VariableDeclaration":
+        return VariableDeclaration(name=data[1], initializer=decode_ast(data[2]))
+    elif node_type == "PrintStatement":
+        return PrintStatement(decode_ast(data[1]))
+    elif node_type == "Assignment":
+        return Assignment(data[1], decode_ast(data[2]))
+    elif node_type == "BinaryOperation":
+        return BinaryOperation(left=decode_ast(data[1]), operator=data[2], right=decode_ast(data[3]))
+    elif node_type == "UnaryOperation":
+        return UnaryOperation(operator=data[1], operand=decode_ast(data[2]))
+    elif node_type == "Literal":
+        return Literal(data[1])
+    elif node_type == "Identifier":
+        return Identifier(data[1])
+    else:
+        raise Exception(f"Unknown AST node type: {node_type}")
+
+
+def load_ast_json(source):
+    """
+    Load an AST written by dump_ast_json.
+
+    :param source: An open file or a string holding the JSON document
+    :return: The root AST node
+    """
+    if isinstance(source, str):
+        return decode_ast(json.loads(source))
+    return decode_ast(json.load(source))
@@ -0,0 +1,127 @@
+from ASTNodes import BinaryOperation, UnaryOperation, Literal, Identifier, Assignment
+from LanguageConstants import TokenType
+
+# Static value types of expressions.
+# Ithon programs are straight-line, so the type of most expressions is known before running them.
+#   NUMBER: a float, or a literal that converts back and forth to the same float (e.g. "5.0")
+#   STRING: a string literal that doesn't convert to a number
+#   UNKNOWN: anything else (None, booleans, other numeric strings, input bindings, concatenated strings)
+NUMBER = "NUMBER"
+STRING = "STRING"
+UNKNOWN = "UNKNOWN"
+
+ARITHMETIC_OPERATORS = (TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH)
+
+
+def literal_type(value):
+    """
+    Get the static type of a literal value.
+
+    :param value: The value of a Literal node
+    :return: The static type of the value
+    """
+    if isinstance(value, float):
+        return NUMBER
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return STRING
+        return NUMBER if repr(number) == value else UNKNOWN
+    return UNKNOWN
+
+
+def binary_result_type(operator, left_type, right_type):
+    """
+    Get the static type of a binary operation that completes without an error.
+
+    :param operator: The token type of the operator
+    :param left_type: The static type of the left operand
+    :param right_type: The static type of the right operand
+    :return: The static type of the result
+    """
+    if left_type == right_type == NUMBER and operator in ARITHMETIC_OPERATORS:
+        return NUMBER
+    # concatenating two strings can give a numeric string (e.g. "in" + "f"), so the result type is unknown
+    return UNKNOWN
+
+
+def unary_result_type(operator, operand_type):
+    """
+    Get the static type of a unary operation that completes without an error.
+
+    :param operator: The token type of the operator
+    :param operand_type: The static type of the operand
+    :return: The static type of the result
+    """
+    if operator == TokenType.MINUS and operand_type == NUMBER:
+        return NUMBER
+    return UNKNOWN
+
+
+def analyze_expression(node, variable_types):
+    """
+    Get the static type of an expression and whether evaluating it can have effects,
+    that is raise an error or assign a variable.
+    Nested assignments update the types of the variables they assign.
+
+    :param node: The expression node
+    :param variable_types: The static types of the defined variables
+    :return: The static type of the expression and whether it can have effects
+    """
+    if isinstance(node, Literal):
+        return literal_type(node.value), False
+    elif isinstance(node, Identifier):
+        return variable_types.get(node.name, UNKNOWN), False
+    elif isinstance(node, BinaryOperation):
+        left_type, left_effects = analyze_expression(node.left, variable_types)
+        right_type, right_effects = analyze_expression(node.right, variable_types)
+        result_type = binary_result_type(node.operator, left_type, right_type)
+        concatenation = left_type == right_type == STRING and node.operator == TokenType.PLUS
+        raises = (result_type == UNKNOWN and not concatenation) or \
+            (node.operator == TokenType.SLASH and not is_nonzero_literal(node.right))
+        return result_type, left_effects or right_effects or raises
+    elif isinstance(node, UnaryOperation):
+        operand_type, operand_effects = analyze_expression(node.operand, variable_types)
+        return unary_result_type(node.operator, operand_type), operand_effects or operand_type != NUMBER
+    elif isinstance(node, Assignment):
+        value_type, _ = analyze_expression(node.value, variable_types)
+        if node.name in variable_types:
+            variable_types[node.name] = value_type
+        return UNKNOWN, True
+    else:
+        raise Exception(f"Unsupported AST node type: {type(node).__name__}")
+
+
+def is_nonzero_literal(node):
+    """
+    Check if a node is a number literal other than zero.
+
+    :param node: The AST node
+    :return: True if the node is a Literal of a nonzero number, otherwise False
+    """
+    return isinstance(node, Literal) and literal_type(node.value) == NUMBER and float(node.value) != 0
+
+
+def variable_names(node):
+    """
+    Get the names of the variables an expression reads and the names it assigns.
+
+    :param node: The expression node
+    :return: The set of read names and the set of assigned names
+    """
+    reads, writes = set(), set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, Identifier):
+            reads.add(node.name)
+        elif isinstance(node, BinaryOperation):
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, UnaryOperation):
+            pending.append(node.operand)
+        elif isinstance(node, Assignment):
+            writes.add(node.name)
+            pending.append(node.value)
+    return reads, writes
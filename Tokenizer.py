@@ -233,8 +233,5 @@ class Tokenizer:
         return self.status_code
 
     def print_tokens(self, stdout, stderr) -> None:
-        for idx, token in enumerate(self.tokens):
-            print(f"{idx:<4}| {token}", file=stdout)
-
-        for idx, err_token in enumerate(self.errors):
-            print(f"{idx:<4}| {err_token}", file=stderr)
+        stdout.writelines(f"{idx:<4}| {token}\n" for idx, token in enumerate(self.tokens))
+        stderr.writelines(f"{idx:<4}| {err_token}\n" for idx, err_token in enumerate(self.errors))
@@ -1,4 +1,6 @@
 class Token:
+    __slots__ = ('token_type', 'lexeme', 'literal')
+
     def __init__(self, token_type: str, lexeme, literal) -> None:
         self.token_type = token_type
         self.lexeme: str = lexeme
@@ -11,6 +13,8 @@ class Token:
         return f"{self.token_type:<15}\t{self.lexeme:<8}\t{self.literal}"
 
 class ErrorToken:
+    __slots__ = ('error_description', 'line_number')
+
     def __init__(self, line_number: int, error_description: str) -> None:
         self.error_description = error_description
         self.line_number = line_number
@@ -0,0 +1,264 @@
+import math
+from functools import partial
+from typing import Iterable
+from ASTNodes import (Block, PrintStatement, VariableDeclaration,
+                      BinaryOperation, UnaryOperation, Literal, Identifier, Assignment)
+from Interpreter import Interpreter
+from LanguageConstants import TokenType
+from StaticAnalysis import NUMBER, UNKNOWN, literal_type, binary_result_type, unary_result_type
+
+PYTHON_OPERATORS = {
+    TokenType.PLUS: "+",
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.SLASH: "/",
+}
+
+
+def already_defined(name):
+    raise Exception(f"Variable '{name}' is already defined.")
+
+
+def not_defined(value, name):
+    raise Exception(f"Variable '{name}' is not defined.")
+
+
+class Transpiler:
+    """
+    A transpiler that turns an Abstract Syntax Tree (AST) into equivalent Python source.
+
+    The program becomes a single Python function whose Ithon variables are local variables.
+    Since Ithon programs are straight-line, whether a variable is defined and the type of most
+    expressions are known while transpiling: operations on known numbers and strings become plain
+    Python operators, everything else goes through the Interpreter's operator implementation.
+    """
+
+    FUNCTION_NAME = "ithon_program"
+    MAX_NESTING = 50  # nesting depth of a generated expression before it is split into temporaries
+
+    def __init__(self, inputs: Iterable[str] = ()):
+        """
+        Initialize the transpiler.
+
+        :param inputs: The names of the variables that are bound when the program starts
+        """
+        self.inputs = list(inputs)
+        self.lines = []
+        self.temporaries = 0
+        self.variable_types = {name: UNKNOWN for name in self.inputs}
+
+    def transpile(self, block: Block) -> str:
+        """
+        Transpile the program into Python source defining a single function.
+        The function takes the print function followed by the input variables.
+
+        :param block: The root Block of the program
+        :return: The generated Python source
+        """
+        parameters = ", ".join(["_print"] + [self.variable(name) for name in self.inputs])
+        for statement in block.statements:
+            self.statement(statement)
+        body = self.lines or ["pass"]
+        return f"def {self.FUNCTION_NAME}({parameters}):\n" + "".join(f"    {line}\n" for line in body)
+
+    @staticmethod
+    def variable(name):
+        """
+        Get the Python name of an Ithon variable.
+        Names that aren't plain ASCII are hex-escaped, since Python rejects some of them and normalizes others
+        to the same identifier (e.g. "\ufb01" and "fi").
+
+        :param name: The Ithon variable name
+        :return: The Python local variable name
+        """
+        if name.isascii():
+            return f"v_{name}"
+        return f"x_{name.encode().hex()}"
+
+    def temporary(self, code):
+        """
+        Store the value of generated code in a new temporary variable.
+
+        :param code: The code to evaluate
+        :return: The name of the temporary
+        """
+        self.temporaries += 1
+        name = f"_t{self.temporaries}"
+        self.lines.append(f"{name} = {code}")
+        return name
+
+    def statement(self, node):
+        """
+        Generate the Python statement of a single Ithon statement.
+
+        :param node: The statement node
+        """
+        if isinstance(node, VariableDeclaration):
+            if node.name in self.variable_types:
+                # the check comes before the initializer is evaluated
+                self.lines.append(f"_already_defined({node.name!r})")
+                return
+            code, value_type = "None", UNKNOWN
+            if node.initializer:
+                code, value_type, _ = self.expression(node.initializer)
+            self.lines.append(f"{self.variable(node.name)} = {code}")
+            self.variable_types[node.name] = value_type
+        elif isinstance(node, Assignment):
+            code, value_type, _ = self.expression(node.value)
+            if node.name in self.variable_types:
+                self.lines.append(f"{self.variable(node.name)} = {code}")
+                self.variable_types[node.name] = value_type
+            else:
+                self.lines.append(f"_not_defined({code}, {node.name!r})")
+        elif isinstance(node, PrintStatement):
+            code, _, _ = self.expression(node.expression)
+            self.lines.append(f"_print({code})")
+        elif isinstance(node, Block):
+            for statement in node.statements:
+                self.statement(statement)
+        else:
+            code, _, _ = self.expression(node)
+            self.lines.append(code)
+
+    def expression(self, node):
+        """
+        Generate the Python expression of an Ithon expression.
+
+        :param node: The expression node
+        :return: The generated code, its static type and its nesting depth
+        """
+        if isinstance(node, Literal):
+            return self.literal(node.value), literal_type(node.value), 0
+        elif isinstance(node, Identifier):
+            if node.name in self.variable_types:
+                return self.variable(node.name), self.variable_types[node.name], 0
+            return "None", UNKNOWN, 0
+        elif isinstance(node, BinaryOperation):
+            return self.binary_operation(node)
+        elif isinstance(node, UnaryOperation):
+            operand, operand_type, depth = self.expression(node.operand)
+            result_type = unary_result_type(node.operator, operand_type)
+            if result_type == NUMBER:
+                code = f"(-{operand})"
+            elif node.operator == TokenType.BANG and operand_type == NUMBER:
+                code = f"(not {operand})"
+            else:
+                code = f"_unary({node.operator!r}, {operand})"
+            return self.limit_depth(code, result_type, depth + 1)
+        elif isinstance(node, Assignment):
+            value, value_type, depth = self.expression(node.value)
+            if node.name in self.variable_types:
+                self.variable_types[node.name] = value_type
+                code = f"({self.variable(node.name)} := {value}, None)[1]"
+            else:
+                code = f"_not_defined({value}, {node.name!r})"
+            return self.limit_depth(code, UNKNOWN, depth + 1)
+        else:
+            raise Exception(f"Unsupported AST node type: {type(node).__name__}")
+
+    def binary_operation(self, node):
+        """
+        Generate the Python expression of a binary operation.
+
+        :param node: The BinaryOperation node
+        :return: The generated code, its static type and its nesting depth
+        """
+        left, left_type, left_depth = self.expression(node.left)
+        emitted = len(self.lines)
+        right, right_type, right_depth = self.expression(node.right)
+        if len(self.lines) > emitted and not isinstance(node.left, Literal):
+            # part of the right operand was split out, the left operand must still be evaluated first
+            self.temporaries += 1
+            spilled = f"_t{self.temporaries}"
+            self.lines.insert(emitted, f"{spilled} = {left}")
+            left, left_depth = spilled, 0
+
+        result_type = binary_result_type(node.operator, left_type, right_type)
+        if result_type != UNKNOWN:
+            code = f"({left} {PYTHON_OPERATORS[node.operator]} {right})"
+        else:
+            code = f"_binary({node.operator!r}, {left}, {right})"
+        return self.limit_depth(code, result_type, max(left_depth, right_depth) + 1)
+
+    def limit_depth(self, code, value_type, depth):
+        """
+        Split generated code into a temporary once it is nested too deeply for the Python parser.
+
+        :param code: The generated code
+        :param value_type: The static type of the code
+        :param depth: The nesting depth of the code
+        :return: The code to use, its static type and its nesting depth
+        """
+        if depth > self.MAX_NESTING:
+            return self.temporary(code), value_type, 0
+        return code, value_type, depth
+
+    @staticmethod
+    def literal(value):
+        """
+        Generate the Python constant of a literal value.
+        Literals that are numbers are folded into floats, everything else keeps its value.
+
+        :param value: The value of the Literal node
+        :return: The generated code
+        """
+        if literal_type(value) == NUMBER:
+            number = float(value)
+            return repr(number) if math.isfinite(number) else f"float({value!r})"
+        return repr(value)
+
+
+class TranspiledProgram:
+    """
+    A program transpiled to Python and compiled to CPython bytecode.
+    """
+
+    def __init__(self, block: Block, inputs: Iterable[str] = ()):
+        """
+        Transpile and compile the program.
+
+        :param block: The root Block of the program
+        :param inputs: The names of the variables that are bound when the program starts
+        """
+        transpiler = Transpiler(inputs)
+        self.inputs = transpiler.inputs
+        self.source = transpiler.transpile(block)
+        operators = Interpreter()
+        namespace = {
+            "_binary": operators.apply_binary_operator,
+            "_unary": operators.apply_unary_operator,
+            "_already_defined": already_defined,
+            "_not_defined": not_defined,
+        }
+        try:
+            code = compile(self.source, "<ithon>", "exec")
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            raise Exception(f"Cannot compile the transpiled program: {e}")
+        exec(code, namespace)
+        self.function = namespace[Transpiler.FUNCTION_NAME]
+
+    def run(self, output=None, bindings=None):
+        """
+        Run the program, reporting runtime errors the way Interpreter.interpret does.
+
+        :param output: The stream to print to, sys.stdout when None
+        :param bindings: A mapping of the input variable names to their values
+        :return: Interpreter.INTERPRETER_SUCCESS if execution was successful, Interpreter.INTERPRETER_ERROR otherwise
+        """
+        bindings = bindings or {}
+        # the program was compiled with its inputs defined, so a missing one can't run as an undefined variable
+        missing = [name for name in self.inputs if name not in bindings]
+        if missing:
+            print(f"Runtime error: Missing value for input {', '.join(repr(name) for name in missing)}.", file=output)
+            return Interpreter.INTERPRETER_ERROR
+        arguments = [bindings[name] for name in self.inputs]
+        try:
+            self.function(partial(print, file=output), *arguments)
+            return Interpreter.INTERPRETER_SUCCESS
+        except ZeroDivisionError:
+            # only plain Python divisions of known numbers can get here
+            print("Runtime error: Division by zero.", file=output)
+            return Interpreter.INTERPRETER_ERROR
+        except Exception as e:
+            print(f"Runtime error: {e}", file=output)
+            return Interpreter.INTERPRETER_ERROR